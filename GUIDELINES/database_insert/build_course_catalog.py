@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Compile the seed data into a single denormalised course catalogue snapshot
+Writes JSON plus gzip/brotli variants and a content-hash ETag so the app can
+load every course in one cacheable request instead of five table queries.
+
+Usage: python build_course_catalog.py [--out DIR] [--seed-dir DIR]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from seed_sql import SEED_DIR, load_seed_tables
+
+# Bump when the snapshot layout changes so clients can discard old copies
+CATALOG_SCHEMA_VERSION = 1
+
+DEFAULT_OUT_DIR = SEED_DIR.parent.parent / 'public' / 'data'
+CATALOG_NAME = 'course-catalog'
+
+
+def tee_totals(holes, tee_id):
+    """Per-tee totals, split front/back like the scorecard"""
+    totals = {
+        'holes': 0,
+        'par': 0,
+        'yards': 0,
+        'meters': 0,
+        'front_nine_yards': 0,
+        'front_nine_meters': 0,
+        'back_nine_yards': 0,
+        'back_nine_meters': 0,
+    }
+    for hole in holes:
+        distance = hole['distances'].get(str(tee_id))
+        if not distance:
+            continue
+        nine = 'front_nine' if hole['hole_number'] <= 9 else 'back_nine'
+        yards = distance['yards'] or 0
+        meters = distance['meters'] or 0
+        totals['holes'] += 1
+        totals['par'] += hole['par']
+        totals['yards'] += yards
+        totals['meters'] += meters
+        totals[f'{nine}_yards'] += yards
+        totals[f'{nine}_meters'] += meters
+    return totals
+
+
+def build_catalog(tables):
+    """
+    Join clubs, courses, tees, holes and distances into one nested document.
+    Returns (catalog, warnings).
+    """
+    warnings = []
+    countries = tables.get('countries', {})
+    regions = tables.get('regions', {})
+    clubs = tables.get('golf_clubs', {})
+    tee_boxes = tables.get('tee_boxes', {})
+    amenities = {a['club_id']: a for a in tables.get('club_amenities', {}).values()}
+
+    holes_by_course = {}
+    for hole in tables.get('holes', {}).values():
+        holes_by_course.setdefault(hole['course_id'], []).append({
+            'id': hole['id'],
+            'hole_number': hole['hole_number'],
+            'par': hole['par'],
+            'handicap_index': hole['handicap_index'],
+            'distances': {},
+        })
+    holes_by_id = {h['id']: h for hs in holes_by_course.values() for h in hs}
+
+    orphans = 0
+    for distance in tables.get('hole_distances', {}).values():
+        hole = holes_by_id.get(distance['hole_id'])
+        tee = tee_boxes.get(distance['tee_box_id'])
+        # The database would reject these rows on the foreign key
+        if hole is None or tee is None:
+            orphans += 1
+            continue
+        hole['distances'][str(tee['id'])] = {
+            'yards': distance['yards'],
+            'meters': distance['meters'],
+        }
+    if orphans:
+        warnings.append(f"{orphans} hole_distances rows reference a missing hole or tee box")
+
+    courses = []
+    for course in sorted(tables.get('golf_courses', {}).values(), key=lambda c: c['id']):
+        club = clubs.get(course['club_id'])
+        if club is None:
+            warnings.append(f"Course {course['id']} references missing club {course['club_id']}")
+            continue
+        holes = sorted(holes_by_course.get(course['id'], []), key=lambda h: h['hole_number'])
+        if len(holes) != course.get('holes'):
+            warnings.append(
+                f"Course {course['id']}: {len(holes)} holes in seed, expected {course.get('holes')}"
+            )
+
+        tees = []
+        for tee in sorted(
+            (t for t in tee_boxes.values() if t['course_id'] == course['id']),
+            key=lambda t: (t.get('display_order') or 0, t['id'])
+        ):
+            tees.append({**tee, 'totals': tee_totals(holes, tee['id'])})
+
+        region = regions.get(club.get('region_id'))
+        country = countries.get(club.get('country_id'))
+        courses.append({
+            **course,
+            'golf_clubs': {
+                **club,
+                'region': region['name'] if region else None,
+                'country': country['name'] if country else None,
+                'amenities': amenities.get(club['id']),
+            },
+            'tee_boxes': tees,
+            'holes': holes,
+            'totals': {
+                'holes': len(holes),
+                'par': sum(h['par'] for h in holes),
+            },
+        })
+
+    catalog = {
+        'version': CATALOG_SCHEMA_VERSION,
+        'courses': courses,
+    }
+    return catalog, warnings
+
+
+def encode_catalog(catalog):
+    """Canonical JSON bytes: sorted keys and no whitespace keep the hash stable"""
+    return json.dumps(
+        catalog, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    ).encode('utf-8')
+
+
+def compute_etag(payload):
+    """Strong ETag derived from the uncompressed payload"""
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def write_variants(payload, out_dir, name=CATALOG_NAME):
+    """Write .json, .json.gz and (if available) .json.br. Returns {suffix: size}"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+
+    (out_dir / f'{name}.json').write_bytes(payload)
+    sizes['json'] = len(payload)
+
+    # mtime=0 keeps the gzip bytes reproducible between builds
+    gz = gzip.compress(payload, compresslevel=9, mtime=0)
+    (out_dir / f'{name}.json.gz').write_bytes(gz)
+    sizes['json.gz'] = len(gz)
+
+    try:
+        import brotli
+    except ImportError:
+        print("[WARNING] brotli not installed - skipping .br variant (pip install brotli)")
+    else:
+        br = brotli.compress(payload, quality=11)
+        (out_dir / f'{name}.json.br').write_bytes(br)
+        sizes['json.br'] = len(br)
+
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed-dir', type=Path, default=SEED_DIR)
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT_DIR)
+    args = parser.parse_args(argv)
+
+    print("Building course catalogue snapshot...")
+    print("-" * 50)
+
+    tables = load_seed_tables(args.seed_dir)
+    catalog, warnings = build_catalog(tables)
+    for warning in warnings:
+        print(f"[WARNING] {warning}")
+
+    if not catalog['courses']:
+        print("[ERROR] No courses found in seed data")
+        sys.exit(1)
+
+    payload = encode_catalog(catalog)
+    etag = compute_etag(payload)
+    sizes = write_variants(payload, args.out)
+
+    manifest = {
+        'version': CATALOG_SCHEMA_VERSION,
+        'etag': etag,
+        'courses': len(catalog['courses']),
+        'files': {f'{CATALOG_NAME}.{suffix}': size for suffix, size in sizes.items()},
+    }
+    (args.out / f'{CATALOG_NAME}.manifest.json').write_text(
+        json.dumps(manifest, indent=2) + '\n', encoding='utf-8'
+    )
+
+    print(f"[OK] {len(catalog['courses'])} courses, ETag {etag}")
+    for suffix, size in sizes.items():
+        print(f"  {CATALOG_NAME}.{suffix}: {size:,} bytes")
+    print(f"Output: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
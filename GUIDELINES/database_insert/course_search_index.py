@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Offline trigram search index for clubs and courses
+Builds an accent-folded trigram inverted index over course, club, city and
+region names from the seed data, so type-ahead search can run locally
+against a small downloaded file instead of a round trip per keystroke.
+Written next to the catalogue with the same compressed variants and a
+manifest carrying the version and ETag for revalidation.
+"Malaga" finds "Málaga", "moralja" finds "La Moraleja", and the last word
+typed is matched as a prefix.
+
+Usage:
+    python course_search_index.py [--out DIR]                  # build
+    python course_search_index.py --query TEXT [--limit N]
+    python course_search_index.py --bench [--sizes N ...] [--budget-ms MS]
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import math
+import random
+import re
+import statistics
+import sys
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from build_course_catalog import DEFAULT_OUT_DIR, compute_etag, write_variants
+from seed_sql import SEED_DIR, load_seed_tables
+
+# Bump when the artifact layout or normalise() changes; clients must rebuild
+SEARCH_INDEX_VERSION = 1
+INDEX_NAME = 'course-search-index'
+
+# Field codes stored with each term, and how much a match on them counts
+FIELDS = ['course', 'club', 'city', 'region']
+FIELD_WEIGHTS = [1.0, 1.0, 0.8, 0.7]
+
+# Vocabulary words at least this similar to a query word count as a match
+WORD_SIMILARITY = 0.3
+MAX_WORD_MATCHES = 20
+WORD_CACHE_SIZE = 4096
+# Names taken per query word. Lists are shortest-name first, and shorter
+# names score higher, so the cap only drops the weakest matches of very
+# common words ("club", "golf")
+MAX_CANDIDATES = 1000
+MIN_SCORE = 0.5
+DEFAULT_LIMIT = 8
+
+BENCH_SIZES = [1000, 10000, 50000]
+BENCH_QUERIES = 1000
+
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalise(text):
+    """Accent-fold and lowercase: 'Logroño, Cádiz' -> 'logrono cadiz'"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    folded = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return NON_ALNUM.sub(' ', folded).strip()
+
+
+def word_trigrams(word, prefix=False):
+    """
+    pg_trgm-style trigrams of one normalised word: two leading spaces and
+    one trailing space. With prefix=True the trailing pad is left off, so an
+    unfinished word still matches the start of a longer one.
+    """
+    padded = f'  {word}' if prefix else f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ============================================
+# Build
+# ============================================
+
+def course_documents(tables):
+    """One searchable document per course: (course_id, club_id, label, detail, fields)"""
+    clubs = tables.get('golf_clubs', {})
+    regions = tables.get('regions', {})
+    docs = []
+    for course in sorted(tables.get('golf_courses', {}).values(), key=lambda c: c['id']):
+        club = clubs.get(course['club_id']) or {}
+        region = regions.get(club.get('region_id')) or {}
+        fields = [course.get('name'), club.get('name'), club.get('city'), region.get('name')]
+        detail = ', '.join(v for v in (club.get('name'), club.get('city'), region.get('name')) if v)
+        docs.append((course['id'], club.get('id'), course['name'], detail, fields))
+    return docs
+
+
+def build_index(docs):
+    """
+    Returns the artifact dict:
+      words    - sorted vocabulary of normalised words
+      trigrams - trigram -> delta-encoded ids of the words containing it
+      terms    - distinct (field, word ids) names with delta-encoded doc ids
+      docs     - [course_id, club_id, label, detail] for display, in label
+                 order so that doc id order is also the alphabetical tie-break
+    """
+    docs = sorted(docs, key=lambda doc: (normalise(doc[2]), doc[0]))
+    term_ids = {}
+    term_docs = []
+    for doc_id, (*_, fields) in enumerate(docs):
+        for field, text in enumerate(fields):
+            words = tuple(normalise(text or '').split())
+            if not words:
+                continue
+            key = (field, words)
+            if key not in term_ids:
+                term_ids[key] = len(term_docs)
+                term_docs.append([])
+            postings = term_docs[term_ids[key]]
+            if not postings or postings[-1] != doc_id:
+                postings.append(doc_id)
+
+    vocabulary = sorted({word for _, words in term_ids for word in words})
+    word_ids = {word: n for n, word in enumerate(vocabulary)}
+    grams = {}
+    for word_id, word in enumerate(vocabulary):
+        for gram in word_trigrams(word):
+            grams.setdefault(gram, []).append(word_id)
+
+    terms = [None] * len(term_docs)
+    for (field, words), term_id in term_ids.items():
+        terms[term_id] = [field, [word_ids[w] for w in words], delta_encode(term_docs[term_id])]
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'words': vocabulary,
+        'trigrams': {gram: delta_encode(ids) for gram, ids in sorted(grams.items())},
+        'terms': terms,
+        'docs': [[course_id, club_id, label, detail]
+                 for course_id, club_id, label, detail, _ in docs],
+    }
+
+
+def delta_encode(ids):
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def delta_decode(deltas):
+    ids, total = [], 0
+    for delta in deltas:
+        total += delta
+        ids.append(total)
+    return ids
+
+
+def encode_index(index):
+    return json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# ============================================
+# Query
+# ============================================
+
+class CourseSearchIndex:
+    """
+    Loaded artifact with a ranked fuzzy search. Each query word is matched
+    against the vocabulary by trigram similarity; a name then scores the
+    IDF-weighted share of query words it matches, so "club" or "golf"
+    count for little and the distinctive word decides the ranking.
+    """
+
+    def __init__(self, index):
+        if index.get('version') != SEARCH_INDEX_VERSION:
+            raise ValueError(
+                f"Search index version {index.get('version')}, expected {SEARCH_INDEX_VERSION}"
+            )
+        self.words = index['words']
+        self.grams = index['trigrams']
+        self.terms = index['terms']
+        self.docs = index['docs']
+        self._decoded = {}
+        self._word_matches = {}
+        self.word_ids = {word: n for n, word in enumerate(self.words)}
+        self.word_grams = [frozenset(word_trigrams(word)) for word in self.words]
+
+        # word id -> term ids (shortest names first), rebuilt here rather
+        # than shipped in the artifact
+        self.word_terms = [[] for _ in self.words]
+        for term_id, (_, word_ids, _) in sorted(enumerate(self.terms),
+                                                key=lambda t: (len(t[1][1]), t[0])):
+            for word_id in set(word_ids):
+                self.word_terms[word_id].append(term_id)
+        self.term_count = max(len(self.terms), 1)
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _postings(self, gram):
+        postings = self._decoded.get(gram)
+        if postings is None:
+            postings = self._decoded[gram] = delta_decode(self.grams.get(gram, ()))
+        return postings
+
+    def match_word(self, word, prefix=False):
+        """{word id: similarity} for the closest vocabulary words"""
+        # Type-ahead resends every earlier word on each keystroke
+        key = (word, prefix)
+        cached = self._word_matches.get(key)
+        if cached is not None:
+            return cached
+        if len(self._word_matches) >= WORD_CACHE_SIZE:
+            self._word_matches.clear()
+
+        # A finished word that is in the vocabulary is taken as typed
+        exact = self.word_ids.get(word)
+        if exact is not None and not prefix:
+            result = self._word_matches[key] = {exact: 1.0}
+            return result
+
+        wanted = word_trigrams(word, prefix)
+        size = len(wanted)
+        # A word reaching WORD_SIMILARITY shares at least `needed` trigrams,
+        # so it is in one of the rarest size - needed + 1 lists
+        needed = max(1, math.ceil(WORD_SIMILARITY * size))
+        by_rarity = sorted(wanted, key=lambda g: len(self.grams.get(g, ())))
+        counts = Counter()
+        for gram in by_rarity[:size - needed + 1]:
+            counts.update(self._postings(gram))
+
+        # Verify candidates by how many rare trigrams they hit. A word seen in
+        # c of those lists shares at most c + needed - 1 trigrams, and its
+        # score is at most shared / size, so once MAX_WORD_MATCHES words beat
+        # that bound the rest cannot make the cut.
+        by_count = {}
+        for word_id, count in counts.items():
+            by_count.setdefault(count, []).append(word_id)
+
+        matches = []
+        word_grams = self.word_grams
+        for count in sorted(by_count, reverse=True):
+            if (len(matches) >= MAX_WORD_MATCHES
+                    and (count + needed - 1) / size < matches[MAX_WORD_MATCHES - 1][0]):
+                break
+            for word_id in by_count[count]:
+                grams = word_grams[word_id]
+                shared = len(wanted & grams)
+                if shared < needed:
+                    continue
+                jaccard = shared / (size + len(grams) - shared)
+                # A prefix only has to be covered; a full word has to match as a whole
+                score = 0.9 * shared / size + 0.1 * jaccard if prefix else jaccard
+                if score >= WORD_SIMILARITY:
+                    matches.append((score, word_id))
+            matches.sort(reverse=True)
+
+        matches.sort(reverse=True)
+        result = self._word_matches[key] = {
+            word_id: score for score, word_id in matches[:MAX_WORD_MATCHES]
+        }
+        return result
+
+    def search(self, query, limit=DEFAULT_LIMIT, min_score=MIN_SCORE):
+        """
+        Ranked matches as dicts with course_id, club_id, label, detail,
+        score and the field that matched best.
+        """
+        words = normalise(query).split()
+        if not words:
+            return []
+
+        # Per query word: its vocabulary matches and an IDF weight
+        parts = []
+        for n, word in enumerate(words):
+            matches = self.match_word(word, prefix=n == len(words) - 1)
+            df = sum(len(self.word_terms[w]) for w in matches)
+            weight = math.log(1 + self.term_count / (1 + min(df, self.term_count)))
+            parts.append((weight, matches))
+        total_weight = sum(weight for weight, _ in parts) or 1.0
+
+        # A name missing every word in a tail whose weight is below
+        # (1 - min_score) of the total cannot reach min_score, so only the
+        # heavier (rarer) words need to supply candidates
+        parts.sort(key=lambda part: -part[0])
+        candidates = set()
+        remaining = total_weight
+        for weight, matches in parts:
+            if remaining < min_score * total_weight:
+                break
+            taken = 0
+            for word_id in matches:
+                postings = self.word_terms[word_id][:MAX_CANDIDATES - taken]
+                candidates.update(postings)
+                taken += len(postings)
+                if taken >= MAX_CANDIDATES:
+                    break
+            remaining -= weight
+
+        scored = []
+        query_length = len(words)
+        for term_id in candidates:
+            field, word_ids, _ = self.terms[term_id]
+            matched = 0.0
+            for weight, matches in parts:
+                best = 0.0
+                for word_id in word_ids:
+                    similarity = matches.get(word_id)
+                    if similarity is not None and similarity > best:
+                        best = similarity
+                matched += weight * best
+            # Small penalty for extra words so "Madrid" beats "Madrid Norte Sur"
+            extra = query_length / len(word_ids) if len(word_ids) > query_length else 1.0
+            score = matched / total_weight * (0.9 + 0.1 * extra) * FIELD_WEIGHTS[field]
+            if score >= min_score:
+                scored.append((score, field, term_id))
+
+        # A document scores its best term, so walking terms best-first gives
+        # each document its final score the first time it is seen. Doc ids
+        # follow label order, so each term only needs its first `limit` new
+        # docs, and the walk stops once `limit` documents are in.
+        scored.sort(key=lambda item: -item[0])
+        best = {}
+        for score, field, term_id in scored:
+            added = 0
+            for doc_id in delta_decode(self.terms[term_id][2]):
+                if doc_id not in best:
+                    best[doc_id] = (score, field)
+                    added += 1
+                    if added == limit:
+                        break
+            if len(best) >= limit:
+                break
+
+        ranked = heapq.nsmallest(limit, ((-score, doc_id, field)
+                                         for doc_id, (score, field) in best.items()))
+        results = []
+        for negative_score, doc_id, field in ranked:
+            score = -negative_score
+            course_id, club_id, label, detail = self.docs[doc_id]
+            results.append({
+                'course_id': course_id,
+                'club_id': club_id,
+                'label': label,
+                'detail': detail,
+                'score': round(score, 3),
+                'matched': FIELDS[field],
+            })
+        return results
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+BENCH_PLACES = [
+    ('Málaga', 'Andalucía'), ('Cádiz', 'Andalucía'), ('Sevilla', 'Andalucía'),
+    ('Marbella', 'Andalucía'), ('Logroño', 'La Rioja'), ('A Coruña', 'Galicia'),
+    ('Ávila', 'Castilla y León'), ('León', 'Castilla y León'), ('Alcobendas', 'Madrid'),
+    ('Pozuelo de Alarcón', 'Madrid'), ('Girona', 'Cataluña'), ('Castellón', 'Comunidad Valenciana'),
+    ('Alicante', 'Comunidad Valenciana'), ('Jerez de la Frontera', 'Andalucía'),
+    ('San Sebastián', 'País Vasco'), ('Santander', 'Cantabria'), ('Palma', 'Islas Baleares'),
+    ('Las Palmas', 'Canarias'), ('Oviedo', 'Asturias'), ('Córdoba', 'Andalucía'),
+]
+BENCH_PREFIXES = ['Real Club de Golf', 'Club de Campo', 'Golf', 'Club de Golf', 'Real Sociedad Hípica',
+                  'Campo de Golf', 'Golf Resort']
+BENCH_SYLLABLES = ['al', 'ba', 'ca', 'ña', 'de', 'do', 'e', 'fa', 'gua', 'he', 'jo', 'la', 'lo', 'ma',
+                   'me', 'mo', 'na', 'ne', 'o', 'pe', 'qui', 'ra', 're', 'ri', 'ro', 'sa', 'so', 'ta',
+                   'te', 'to', 'va', 'vi', 'za', 'zo', 'rí', 'ló', 'bé', 'tá']
+BENCH_SUFFIXES = ['Norte', 'Sur', 'Este', 'Oeste', 'Championship', 'Pitch & Putt', 'Old Course']
+
+
+def bench_name(rng):
+    """Invented place name, e.g. 'Valdezorí', so names are mostly distinct"""
+    return ''.join(rng.choice(BENCH_SYLLABLES) for _ in range(rng.randint(3, 4))).capitalize()
+
+
+def synthetic_documents(n, rng):
+    docs = []
+    for doc_id in range(n):
+        city, region = rng.choice(BENCH_PLACES)
+        base = f"{rng.choice(['La', 'El', 'Los', 'Las', ''])} {bench_name(rng)}".strip()
+        club = f"{rng.choice(BENCH_PREFIXES)} {base}"
+        course = f"{base} {rng.choice(BENCH_SUFFIXES)}"
+        docs.append((doc_id, doc_id, course, club, [course, club, city, region]))
+    return docs
+
+
+def typo(text, rng):
+    """Drop, swap or replace one letter"""
+    chars = list(text)
+    letters = [i for i, ch in enumerate(chars) if ch.isalpha()]
+    i = rng.choice(letters[1:-1] or letters)
+    kind = rng.randrange(3)
+    if kind == 0:
+        del chars[i]
+    elif kind == 1 and i + 1 < len(chars):
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    else:
+        chars[i] = rng.choice('aeiourstln')
+    return ''.join(chars)
+
+
+def bench_queries(docs, rng):
+    """(query, expected course label or None) - prefixes, typos and unaccented names"""
+    queries = []
+    for _ in range(BENCH_QUERIES):
+        _, _, course, club, fields = rng.choice(docs)
+        kind = rng.randrange(4)
+        if kind == 0:
+            queries.append((course[:rng.randint(3, len(course))], None))
+        elif kind == 1:
+            queries.append((typo(course, rng), course))
+        elif kind == 2:
+            queries.append((normalise(club), None))
+        else:
+            queries.append((normalise(fields[2])[:rng.randint(3, 6)], None))
+    return queries
+
+
+def run_benchmark(sizes, budget_ms):
+    rng = random.Random(11)
+    print(f"{'docs':>8} {'build':>8} {'json':>11} {'gzip':>10} {'load':>8} "
+          f"{'p50':>8} {'p99':>8} {'typo hit@5':>11}")
+    over_budget = False
+    for n in sizes:
+        docs = synthetic_documents(n, rng)
+        start = time.perf_counter()
+        payload = encode_index(build_index(docs))
+        build_ms = (time.perf_counter() - start) * 1000
+        compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+
+        start = time.perf_counter()
+        index = CourseSearchIndex(json.loads(gzip.decompress(compressed)))
+        load_ms = (time.perf_counter() - start) * 1000
+
+        queries = bench_queries(docs, rng)
+        timings, typo_total, typo_hits = [], 0, 0
+        for query, expected in queries:
+            start = time.perf_counter()
+            results = index.search(query, limit=5)
+            timings.append((time.perf_counter() - start) * 1000)
+            if expected:
+                typo_total += 1
+                typo_hits += any(r['label'] == expected for r in results)
+        timings.sort()
+        p50, p99 = statistics.median(timings), timings[int(len(timings) * 0.99)]
+        print(f"{n:>8,} {build_ms:>6.0f}ms {len(payload):>10,}B {len(compressed):>9,}B "
+              f"{load_ms:>6.0f}ms {p50:>6.2f}ms {p99:>6.2f}ms {typo_hits / typo_total:>10.0%}")
+        over_budget |= p99 > budget_ms
+
+    print(f"\n({BENCH_QUERIES} queries per size: prefixes, one-letter typos, "
+          f"unaccented names; budget {budget_ms} ms at p99)")
+    if over_budget:
+        print("[ERROR] p99 query latency over budget")
+        sys.exit(1)
+    print("[OK] All queries within budget")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed-dir', type=Path, default=SEED_DIR)
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument('--query')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT)
+    parser.add_argument('--bench', action='store_true')
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCH_SIZES)
+    # Half a 60 Hz frame per keystroke, leaving the rest for rendering
+    parser.add_argument('--budget-ms', type=float, default=8.0)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        run_benchmark(args.sizes, args.budget_ms)
+        return
+
+    if args.query is not None:
+        path = args.out / f'{INDEX_NAME}.json.gz'
+        if not path.exists():
+            print(f"[ERROR] {path} not found - build it first")
+            sys.exit(1)
+        index = CourseSearchIndex.load(path)
+        start = time.perf_counter()
+        results = index.search(args.query, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for r in results:
+            print(f"  {r['score']:.3f}  {r['label']}  ({r['detail']}) [{r['matched']}]")
+        if not results:
+            print("  No matches")
+        print(f"{len(results)} results in {elapsed:.2f} ms")
+        return
+
+    print("Building course search index...")
+    print("-" * 50)
+    docs = course_documents(load_seed_tables(args.seed_dir))
+    if not docs:
+        print("[ERROR] No courses found in seed data")
+        sys.exit(1)
+
+    index = build_index(docs)
+    payload = encode_index(index)
+    etag = compute_etag(payload)
+    sizes = write_variants(payload, args.out, INDEX_NAME)
+
+    manifest = {
+        'version': SEARCH_INDEX_VERSION,
+        'etag': etag,
+        'courses': len(index['docs']),
+        'files': {f'{INDEX_NAME}.{suffix}': size for suffix, size in sizes.items()},
+    }
+    (args.out / f'{INDEX_NAME}.manifest.json').write_text(
+        json.dumps(manifest, indent=2) + '\n', encoding='utf-8'
+    )
+
+    print(f"[OK] {len(index['docs'])} courses, {len(index['terms'])} terms, "
+          f"{len(index['words'])} words, {len(index['trigrams'])} trigrams, ETag {etag}")
+    for suffix, size in sizes.items():
+        print(f"  {INDEX_NAME}.{suffix}: {size:,} bytes")
+    print(f"Output: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
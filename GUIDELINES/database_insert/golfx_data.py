@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Golf X data tooling CLI
+One entry point for the Python scripts around the seed data. Heavy modules
+(requests, the tool modules themselves) are imported inside the subcommand
+that needs them, so offline commands start in milliseconds, and every
+network command in a process shares one keep-alive HTTP connection pool.
+
+Usage:
+    python golfx_data.py extract-styles
+    python golfx_data.py gen-image-sql [--kind aerial|default]
+    python golfx_data.py upload-images [--kind aerial|default|all] [--workers N]
+    python golfx_data.py verify-seed [--online]
+    python golfx_data.py bench-startup [--runs N] [--budget-ms MS]
+    python golfx_data.py TOOL [...]   (build-catalog, index-advisor, validate-images,
+                                       plan-regression, synthetic-load, session-rollup,
+                                       geo-index, search-index)
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+IMAGES_DIR = SCRIPT_DIR.parent / 'images'
+DEFAULT_ENV_FILE = REPO_ROOT / '.env'
+
+# Aerial photos are each course's primary image; ground views come second
+IMAGE_SETS = {
+    'aerial': {
+        'courses': [1, 2, 3, 4],
+        'suffix': '_aerial.jpg',
+        'title': 'La Moraleja Course {id} - Aerial View',
+        'description': 'Aerial view of La Moraleja Course {id}',
+        'is_primary': True,
+        'display_order': 1,
+        'sql_name': '10_course{id}_image.sql',
+    },
+    'default': {
+        'courses': [1, 2, 3, 4, 5],
+        'suffix': '_default.jpg',
+        'title': 'La Moraleja Course {id} - Course View',
+        'description': 'Ground view of La Moraleja Course {id}',
+        'is_primary': False,
+        'display_order': 2,
+        'sql_name': '10_course{id}_default_image.sql',
+    },
+}
+
+# Subcommands that forward their arguments to a tool module's main(argv)
+DELEGATES = {
+    'build-catalog': ('build_course_catalog', "Build the compressed course catalogue snapshot"),
+    'index-advisor': ('schema_index_advisor', "Audit FK and filter columns against indexes"),
+    'validate-images': ('validate_image_sql', "Validate the image SQL artifacts offline"),
+    'plan-regression': ('plan_regression', "Run the query-plan regression harness"),
+    'synthetic-load': ('synthetic_load', "Generate COPY files of synthetic games at scale"),
+    'session-rollup': ('session_rollup', "Roll user_sessions exports into hourly/daily tables"),
+    'geo-index': ('nearest_course_index', "Build or query the nearest-club index"),
+    'search-index': ('course_search_index', "Build or query the course search index"),
+}
+
+# Modules an offline command must never pull in (checked by bench-startup)
+NETWORK_MODULES = ('requests', 'urllib3', 'supabase', 'httpx', 'dotenv')
+
+
+# ============================================
+# Shared network client
+# ============================================
+
+def load_env(env_file):
+    """Read KEY=VALUE lines into os.environ without overriding existing values"""
+    if not env_file.exists():
+        return
+    with open(env_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            os.environ.setdefault(key.strip(), value.strip().strip('"').strip("'"))
+
+
+class SupabaseRest:
+    """Thin PostgREST client over a pooled keep-alive requests.Session"""
+
+    def __init__(self, url, key, pool_size):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base = url.rstrip('/') + '/rest/v1'
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'apikey': key,
+            'Authorization': f'Bearer {key}',
+            'Content-Type': 'application/json',
+        })
+
+    def select(self, table, **params):
+        response = self.session.get(f'{self.base}/{table}', params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def count(self, table):
+        response = self.session.head(
+            f'{self.base}/{table}', params={'select': 'id'},
+            headers={'Prefer': 'count=exact', 'Range': '0-0'}, timeout=30
+        )
+        response.raise_for_status()
+        return int(response.headers.get('Content-Range', '*/0').split('/')[-1])
+
+    def update(self, table, values, **params):
+        response = self.session.patch(f'{self.base}/{table}', params=params, json=values, timeout=30)
+        response.raise_for_status()
+
+    def rpc(self, function, payload):
+        response = self.session.post(f'{self.base}/rpc/{function}', json=payload, timeout=120)
+        response.raise_for_status()
+        return response.json()
+
+
+_client = None
+
+
+def get_client(env_file=DEFAULT_ENV_FILE, pool_size=4):
+    """Create the shared client on first use; later callers reuse its pool"""
+    global _client
+    if _client is None:
+        load_env(env_file)
+        url = os.environ.get("VITE_SUPABASE_URL")
+        key = os.environ.get("VITE_SUPABASE_ANON_KEY")
+        if not url or not key:
+            print("[ERROR] Supabase credentials not found!")
+            print(f"Checked environment and {env_file}")
+            sys.exit(1)
+        print("Connecting to Supabase...")
+        _client = SupabaseRest(url, key, pool_size)
+    return _client
+
+
+# ============================================
+# Subcommands
+# ============================================
+
+def cmd_extract_styles(args):
+    # scripts/extract-styles.py has a dash in its name, so load it by path
+    import importlib.util
+
+    path = REPO_ROOT / 'scripts' / 'extract-styles.py'
+    spec = importlib.util.spec_from_file_location('extract_styles', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.main()
+
+
+def cmd_gen_image_sql(args):
+    from insert_images_direct import generate_insert_sql
+
+    print("Generating SQL for image insertions...")
+    print("-" * 50)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    generated = 0
+    for kind in image_kinds(args.kind):
+        spec = IMAGE_SETS[kind]
+        for course_id in spec['courses']:
+            image_path = IMAGES_DIR / f'la-moraleja-{course_id}{spec["suffix"]}'
+            if not image_path.exists():
+                print(f"[ERROR] Image not found: {image_path}")
+                continue
+            sql = generate_insert_sql(
+                course_id, image_path, image_type=kind,
+                title=spec['title'].format(id=course_id),
+                description=spec['description'].format(id=course_id),
+                is_primary=spec['is_primary'],
+                display_order=spec['display_order'],
+            )
+            output_file = args.out_dir / spec['sql_name'].format(id=course_id)
+            output_file.write_text(sql, encoding='utf-8')
+            generated += 1
+            print(f"Processing: {image_path.name} for Course {course_id}")
+            print(f"  -> Saved to {output_file.name}")
+    print("-" * 50)
+    print(f"Generated {generated} SQL files")
+
+
+def upload_image(client, course_id, kind, image_path):
+    """Insert one image unless the course already has one of this type"""
+    spec = IMAGE_SETS[kind]
+    existing = client.select('course_images', select='id',
+                             course_id=f'eq.{course_id}', image_type=f'eq.{kind}')
+    if existing:
+        return f"[SKIP] Course {course_id} {kind}: already exists (ID: {existing[0]['id']})"
+
+    image_data = image_path.read_bytes()
+    image_id = client.rpc('insert_course_image', {
+        'p_course_id': course_id,
+        'p_hole_id': None,
+        'p_image_type': kind,
+        'p_title': spec['title'].format(id=course_id),
+        'p_mime_type': 'image/jpeg',
+        'p_image_data': f'\\x{image_data.hex()}',
+    })
+    # The RPC only takes the core columns; ordering and flags follow separately
+    client.update('course_images', {
+        'description': spec['description'].format(id=course_id),
+        'is_primary': spec['is_primary'],
+        'display_order': spec['display_order'],
+    }, id=f'eq.{image_id}')
+    return f"[OK] Course {course_id} {kind}: inserted {len(image_data):,} bytes"
+
+
+def cmd_upload_images(args):
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = get_client(args.env_file, pool_size=args.workers)
+
+    print("=" * 60)
+    print("INSERTING IMAGES INTO SUPABASE")
+    print("=" * 60)
+
+    jobs = []
+    failed = 0
+    for kind in image_kinds(args.kind):
+        spec = IMAGE_SETS[kind]
+        for course_id in spec['courses']:
+            image_path = IMAGES_DIR / f'la-moraleja-{course_id}{spec["suffix"]}'
+            if not image_path.exists():
+                print(f"[ERROR] File not found: {image_path.name}")
+                failed += 1
+                continue
+            jobs.append((course_id, kind, image_path))
+
+    # Workers share the session, so uploads reuse pooled keep-alive connections
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(upload_image, client, *job) for job in jobs]
+        for (course_id, kind, _), future in zip(jobs, futures):
+            try:
+                print(future.result())
+            except Exception as e:
+                print(f"[ERROR] Course {course_id} {kind}: {str(e)[:100]}")
+                failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"RESULTS: {len(jobs) - failed} ok, {failed} failed")
+
+    images = client.select('course_images', select='course_id,image_type,title,file_size',
+                           order='course_id,image_type')
+    print(f"\nTotal images in database: {len(images)}")
+    for img in images:
+        print(f"  Course {img['course_id']} ({img['image_type']}): "
+              f"{img['file_size'] or 0:,} bytes - {img['title']}")
+    if failed:
+        sys.exit(1)
+
+
+def cmd_verify_seed(args):
+    import verify_data
+
+    # verify_data opens the seed files relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(SCRIPT_DIR)
+    try:
+        verify_data.main()
+    finally:
+        os.chdir(cwd)
+
+    if not args.online:
+        return
+
+    from seed_sql import load_seed_tables
+
+    print("\n=== Comparing Row Counts With Supabase ===")
+    client = get_client(args.env_file)
+    mismatches = 0
+    for table, rows in load_seed_tables().items():
+        live = client.count(table)
+        status = 'OK' if live >= len(rows) else '!'
+        mismatches += status != 'OK'
+        print(f"[{status}] {table}: {len(rows)} seed rows, {live} in database")
+    if mismatches:
+        sys.exit(1)
+
+
+def cmd_bench_startup(args):
+    """Time offline commands in fresh interpreters and check no network module loads"""
+    import statistics
+    import subprocess
+    import time
+
+    commands = [['--help'], ['verify-seed'], ['gen-image-sql', '--help']]
+    worst = 0.0
+    leaked = False
+    print(f"Startup benchmark ({args.runs} runs each, budget {args.budget_ms:.0f} ms)")
+    print("-" * 50)
+    for command in commands:
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, __file__, *command], cwd=SCRIPT_DIR,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        worst = max(worst, median)
+
+        # -X importtime lists every module the command imported
+        trace = subprocess.run([sys.executable, '-X', 'importtime', __file__, *command],
+                               cwd=SCRIPT_DIR, capture_output=True, text=True)
+        imported = {line.rsplit('|', 1)[-1].strip().split('.')[0]
+                    for line in trace.stderr.splitlines() if line.startswith('import time:')}
+        heavy = sorted(imported & set(NETWORK_MODULES))
+        leaked |= bool(heavy)
+        note = f"  [!] imported {', '.join(heavy)}" if heavy else ''
+        print(f"  {' '.join(command):24} median {median:7.1f} ms{note}")
+
+    # Interpreter startup alone, for reference
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    print(f"  {'(bare python)':24} {(time.perf_counter() - start) * 1000:12.1f} ms")
+
+    if leaked or worst > args.budget_ms:
+        print("[ERROR] Offline startup over budget or importing network modules")
+        sys.exit(1)
+    print("[OK] Offline commands within budget")
+
+
+def image_kinds(kind):
+    return list(IMAGE_SETS) if kind == 'all' else [kind]
+
+
+# ============================================
+# Entry point
+# ============================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='golfx_data.py', description="Golf X data tooling")
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    p = sub.add_parser('extract-styles', help="Extract CSS from styles.md")
+    p.set_defaults(func=cmd_extract_styles)
+
+    p = sub.add_parser('gen-image-sql', help="Write hex-encoded image INSERT files")
+    p.add_argument('--kind', choices=[*IMAGE_SETS, 'all'], default='aerial')
+    p.add_argument('--out-dir', type=Path, default=SCRIPT_DIR)
+    p.set_defaults(func=cmd_gen_image_sql)
+
+    p = sub.add_parser('upload-images', help="Upload course images through PostgREST")
+    p.add_argument('--kind', choices=[*IMAGE_SETS, 'all'], default='all')
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--env-file', type=Path, default=DEFAULT_ENV_FILE)
+    p.set_defaults(func=cmd_upload_images)
+
+    p = sub.add_parser('verify-seed', help="Check seed files (and live row counts with --online)")
+    p.add_argument('--online', action='store_true')
+    p.add_argument('--env-file', type=Path, default=DEFAULT_ENV_FILE)
+    p.set_defaults(func=cmd_verify_seed)
+
+    p = sub.add_parser('bench-startup', help="Benchmark offline command startup time")
+    p.add_argument('--runs', type=int, default=10)
+    p.add_argument('--budget-ms', type=float, default=150.0)
+    p.set_defaults(func=cmd_bench_startup)
+
+    for name, (_, help_text) in DELEGATES.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Delegated tools parse their own arguments
+    if argv and argv[0] in DELEGATES:
+        import importlib
+
+        module = importlib.import_module(DELEGATES[argv[0]][0])
+        return module.main(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,12 +14,15 @@ def convert_image_to_hex(image_path):
         image_data = f.read()
     return image_data.hex(), len(image_data)
 
-def generate_insert_sql(course_id, image_path):
+def generate_insert_sql(course_id, image_path, image_type='aerial',
+                        title=None, description=None, is_primary=True, display_order=1):
     """Generate SQL insert statement for an image"""
     hex_data, file_size = convert_image_to_hex(image_path)
+    title = title or f'La Moraleja Course {course_id} - Aerial View'
+    description = description or f'Aerial view of La Moraleja Course {course_id}'
     
     sql = f"""
--- Insert aerial image for La Moraleja Course {course_id}
+-- Insert {image_type} image for La Moraleja Course {course_id}
 -- File: {image_path.name} ({file_size} bytes)
 INSERT INTO course_images (
     course_id,
@@ -35,14 +38,14 @@ INSERT INTO course_images (
 ) VALUES (
     {course_id},
     NULL,
-    'aerial',
-    'La Moraleja Course {course_id} - Aerial View',
+    '{image_type}',
+    '{title}',
     'image/jpeg',
     '\\x{hex_data}'::bytea,
     {file_size},
-    true,
-    1,
-    'Aerial view of La Moraleja Course {course_id}'
+    {'true' if is_primary else 'false'},
+    {display_order},
+    '{description}'
 ) ON CONFLICT DO NOTHING;
 """
     return sql
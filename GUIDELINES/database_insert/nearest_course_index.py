@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Precomputed nearest-club index for "courses near me"
+Builds a static KD-tree over club coordinates from the seed data
+(03_golf_clubs.sql) and serialises it to a compact binary artifact.
+Points are stored as unit vectors on the sphere, so straight-line distance
+orders results exactly like great-circle distance, with no special cases
+at the poles or the antimeridian.
+
+Usage:
+    python nearest_course_index.py [--out DIR]                     # build
+    python nearest_course_index.py --query LAT LON [--k N] [--radius-km KM]
+    python nearest_course_index.py --bench [--sizes N ...] [--budget-ms MS]
+"""
+
+import argparse
+import heapq
+import json
+import math
+import random
+import statistics
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from seed_sql import SEED_DIR, load_seed_tables
+
+# Bump when the binary layout changes
+GEO_INDEX_VERSION = 1
+MAGIC = b'GXGEO\0'
+HEADER = struct.Struct('<6sHII')   # magic, version, count, metadata bytes
+
+DEFAULT_OUT_DIR = SEED_DIR.parent.parent / 'public' / 'data'
+INDEX_NAME = 'club-geo-index.bin'
+
+EARTH_RADIUS_KM = 6371.0088
+
+BENCH_SIZES = [1, 100, 1000, 10000, 50000]
+BENCH_QUERIES = 2000
+
+
+def to_unit_vector(lat, lon):
+    lat, lon = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat)
+    return cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat)
+
+
+def chord_to_km(chord_sq):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(chord_sq) / 2, 1.0))
+
+
+def km_to_chord_sq(km):
+    return (2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)) ** 2
+
+
+class NearestCourseIndex:
+    """
+    Implicit KD-tree: each subrange [lo, hi) of the arrays is a node whose
+    point sits at the middle position, split on the axis stored there.
+    No child pointers are needed, which keeps the artifact small.
+    """
+
+    def __init__(self, coords, axes, ids, metadata):
+        self.coords = coords        # array('f'): x, y, z per point
+        self.axes = axes            # bytes: split axis per position
+        self.ids = ids              # array('i'): club id per position
+        self.metadata = metadata    # {club id: {...}}
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ----------------------------------------
+    # Build / serialise
+    # ----------------------------------------
+
+    @classmethod
+    def build(cls, points, metadata=None):
+        """points: iterable of (club_id, lat, lon)"""
+        nodes = [(*to_unit_vector(lat, lon), club_id) for club_id, lat, lon in points]
+        axes = bytearray(len(nodes))
+        stack = [(0, len(nodes))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= 1:
+                continue
+            # Split on the axis with the widest spread
+            spreads = [max(p[a] for p in nodes[lo:hi]) - min(p[a] for p in nodes[lo:hi])
+                       for a in range(3)]
+            axis = spreads.index(max(spreads))
+            nodes[lo:hi] = sorted(nodes[lo:hi], key=lambda p: p[axis])
+            mid = (lo + hi) // 2
+            axes[mid] = axis
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+
+        coords = array('f', (c for p in nodes for c in p[:3]))
+        ids = array('i', (p[3] for p in nodes))
+        return cls(coords, bytes(axes), ids, metadata or {})
+
+    def to_bytes(self):
+        meta = json.dumps(
+            {str(k): v for k, v in sorted(self.metadata.items())},
+            sort_keys=True, separators=(',', ':'), ensure_ascii=False
+        ).encode('utf-8')
+        coords = array('f', self.coords)
+        ids = array('i', self.ids)
+        if sys.byteorder != 'little':
+            coords.byteswap()
+            ids.byteswap()
+        padding = b'\0' * (-len(self.axes) % 4)
+        return b''.join([
+            HEADER.pack(MAGIC, GEO_INDEX_VERSION, len(self.ids), len(meta)),
+            self.axes, padding, coords.tobytes(), ids.tobytes(), meta,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, count, meta_len = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a club geo index")
+        if version != GEO_INDEX_VERSION:
+            raise ValueError(f"Geo index version {version}, expected {GEO_INDEX_VERSION}")
+        offset = HEADER.size
+        axes = bytes(data[offset:offset + count])
+        offset += count + (-count % 4)
+        coords = array('f')
+        coords.frombytes(data[offset:offset + count * 12])
+        offset += count * 12
+        ids = array('i')
+        ids.frombytes(data[offset:offset + count * 4])
+        offset += count * 4
+        if sys.byteorder != 'little':
+            coords.byteswap()
+            ids.byteswap()
+        meta = json.loads(data[offset:offset + meta_len].decode('utf-8'))
+        return cls(coords, axes, ids, {int(k): v for k, v in meta.items()})
+
+    def save(self, path):
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(path.read_bytes())
+
+    # ----------------------------------------
+    # Queries
+    # ----------------------------------------
+
+    def _result(self, chord_sq, position):
+        club_id = self.ids[position]
+        return {
+            'club_id': club_id,
+            'distance_km': round(chord_to_km(chord_sq), 3),
+            **self.metadata.get(club_id, {}),
+        }
+
+    def nearest(self, lat, lon, k=5, max_km=None):
+        """The k closest clubs, nearest first, optionally within max_km"""
+        if not self.ids or k <= 0:
+            return []
+        qx, qy, qz = to_unit_vector(lat, lon)
+        query = (qx, qy, qz)
+        coords, axes = self.coords, self.axes
+        limit = km_to_chord_sq(max_km) if max_km is not None else math.inf
+        best = []       # max-heap of (-chord_sq, position)
+        bound = limit
+        stack = [(0, len(self.ids), 0.0)]
+        while stack:
+            lo, hi, plane = stack.pop()
+            # The bound may have shrunk since this subtree was pushed
+            if lo >= hi or plane > bound:
+                continue
+            mid = (lo + hi) >> 1
+            i = mid * 3
+            dx = coords[i] - qx
+            dy = coords[i + 1] - qy
+            dz = coords[i + 2] - qz
+            d = dx * dx + dy * dy + dz * dz
+            if d <= bound:
+                if len(best) < k:
+                    heapq.heappush(best, (-d, mid))
+                else:
+                    heapq.heappushpop(best, (-d, mid))
+                if len(best) == k:
+                    bound = min(limit, -best[0][0])
+            if hi - lo == 1:
+                continue
+            axis = axes[mid]
+            diff = query[axis] - coords[i + axis]
+            plane = diff * diff
+            # Far side is pushed first so the near side is searched first;
+            # it is skipped if the splitting plane is already out of range
+            if diff > 0:
+                if plane <= bound:
+                    stack.append((lo, mid, plane))
+                stack.append((mid + 1, hi, 0.0))
+            else:
+                if plane <= bound:
+                    stack.append((mid + 1, hi, plane))
+                stack.append((lo, mid, 0.0))
+        return [self._result(-d, p) for d, p in sorted(best, reverse=True)]
+
+    def within(self, lat, lon, radius_km):
+        """Every club within radius_km, nearest first"""
+        if not self.ids:
+            return []
+        qx, qy, qz = to_unit_vector(lat, lon)
+        query = (qx, qy, qz)
+        coords, axes = self.coords, self.axes
+        bound = km_to_chord_sq(radius_km)
+        found = []
+        stack = [(0, len(self.ids))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) >> 1
+            i = mid * 3
+            dx = coords[i] - qx
+            dy = coords[i + 1] - qy
+            dz = coords[i + 2] - qz
+            d = dx * dx + dy * dy + dz * dz
+            if d <= bound:
+                found.append((d, mid))
+            if hi - lo == 1:
+                continue
+            axis = axes[mid]
+            diff = query[axis] - coords[i + axis]
+            if diff <= 0 or diff * diff <= bound:
+                stack.append((lo, mid))
+            if diff >= 0 or diff * diff <= bound:
+                stack.append((mid + 1, hi))
+        return [self._result(d, p) for d, p in sorted(found)]
+
+
+# ============================================
+# Seed data
+# ============================================
+
+def club_points(tables):
+    """(points, metadata) for every club with coordinates"""
+    courses_by_club = {}
+    for course in tables.get('golf_courses', {}).values():
+        courses_by_club.setdefault(course['club_id'], []).append(course['id'])
+
+    points, metadata, skipped = [], {}, []
+    for club in sorted(tables.get('golf_clubs', {}).values(), key=lambda c: c['id']):
+        lat, lon = club.get('latitude'), club.get('longitude')
+        if lat is None or lon is None:
+            skipped.append(club['id'])
+            continue
+        points.append((club['id'], float(lat), float(lon)))
+        metadata[club['id']] = {
+            'name': club['name'],
+            'slug': club.get('slug'),
+            'city': club.get('city'),
+            'latitude': float(lat),
+            'longitude': float(lon),
+            'course_ids': sorted(courses_by_club.get(club['id'], [])),
+        }
+    return points, metadata, skipped
+
+
+# ============================================
+# Benchmark
+# ============================================
+
+def synthetic_points(n, rng):
+    """Clubs clustered around metro areas across Europe, like real golf courses"""
+    centres = [(rng.uniform(36, 60), rng.uniform(-10, 30)) for _ in range(max(n // 50, 1))]
+    points = []
+    for club_id in range(1, n + 1):
+        lat, lon = rng.choice(centres)
+        points.append((club_id, lat + rng.gauss(0, 0.3), lon + rng.gauss(0, 0.4)))
+    return points
+
+
+def brute_force(points, lat, lon, k):
+    """Distances (km) of the k nearest points by linear scan"""
+    q = to_unit_vector(lat, lon)
+    chords = sorted(sum((a - b) ** 2 for a, b in zip(to_unit_vector(plat, plon), q))
+                    for _, plat, plon in points)
+    return [chord_to_km(c) for c in chords[:k]]
+
+
+def time_queries(fn, queries):
+    timings = []
+    for lat, lon in queries:
+        start = time.perf_counter()
+        fn(lat, lon)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+def run_benchmark(sizes, budget_ms, k=5, radius_km=25):
+    rng = random.Random(7)
+    print(f"{'clubs':>8} {'build':>9} {'size':>10} {'knn p50':>9} {'knn p99':>9} "
+          f"{'radius p50':>11} {'radius p99':>11} {'hits':>6}")
+    over_budget = False
+    for n in sizes:
+        points = synthetic_points(n, rng)
+        start = time.perf_counter()
+        built = NearestCourseIndex.build(points)
+        build_ms = (time.perf_counter() - start) * 1000
+        data = built.to_bytes()
+        index = NearestCourseIndex.from_bytes(data)
+
+        queries = [(rng.uniform(36, 60), rng.uniform(-10, 30)) for _ in range(BENCH_QUERIES // 2)]
+        queries += [(lat + rng.gauss(0, 0.2), lon + rng.gauss(0, 0.2))
+                    for _, lat, lon in rng.sample(points, min(len(points), BENCH_QUERIES // 2))]
+
+        # Correctness against a linear scan on a sample of queries
+        for lat, lon in queries[:20]:
+            expected = brute_force(points, lat, lon, k)
+            got = [r['distance_km'] for r in index.nearest(lat, lon, k)]
+            # Coordinates are stored as float32 (~0.5 m), so compare distances
+            if len(got) != len(expected) or any(abs(a - b) > 0.01 for a, b in zip(got, expected)):
+                print(f"[ERROR] nearest({lat:.4f}, {lon:.4f}) returned {got}, expected {expected}")
+                sys.exit(1)
+
+        knn = time_queries(lambda lat, lon: index.nearest(lat, lon, k), queries)
+        radius = time_queries(lambda lat, lon: index.within(lat, lon, radius_km), queries)
+        hits = statistics.mean(len(index.within(lat, lon, radius_km)) for lat, lon in queries[:200])
+        print(f"{n:>8,} {build_ms:>7.0f}ms {len(data):>9,}B {knn[0]:>7.3f}ms {knn[1]:>7.3f}ms "
+              f"{radius[0]:>9.3f}ms {radius[1]:>9.3f}ms {hits:>6.1f}")
+        over_budget |= max(knn[1], radius[1]) > budget_ms
+
+    print(f"\n(k={k}, radius={radius_km} km, {BENCH_QUERIES} queries per size, "
+          f"budget {budget_ms} ms at p99)")
+    if over_budget:
+        print("[ERROR] p99 lookup over budget")
+        sys.exit(1)
+    print("[OK] All lookups within budget")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed-dir', type=Path, default=SEED_DIR)
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument('--query', nargs=2, type=float, metavar=('LAT', 'LON'))
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--radius-km', type=float)
+    parser.add_argument('--bench', action='store_true')
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCH_SIZES)
+    parser.add_argument('--budget-ms', type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        run_benchmark(args.sizes, args.budget_ms)
+        return
+
+    path = args.out / INDEX_NAME
+    if args.query:
+        if not path.exists():
+            print(f"[ERROR] {path} not found - build it first")
+            sys.exit(1)
+        index = NearestCourseIndex.load(path)
+        lat, lon = args.query
+        if args.radius_km is not None:
+            results = index.within(lat, lon, args.radius_km)
+        else:
+            results = index.nearest(lat, lon, args.k)
+        for result in results:
+            print(f"{result['distance_km']:>9.2f} km  {result.get('name', result['club_id'])}"
+                  f"  courses {result.get('course_ids', [])}")
+        if not results:
+            print("No clubs found")
+        return
+
+    print("Building nearest-club index...")
+    print("-" * 50)
+    points, metadata, skipped = club_points(load_seed_tables(args.seed_dir))
+    for club_id in skipped:
+        print(f"[WARNING] Club {club_id} has no coordinates - not indexed")
+    if not points:
+        print("[ERROR] No clubs with coordinates in seed data")
+        sys.exit(1)
+
+    index = NearestCourseIndex.build(points, metadata)
+    args.out.mkdir(parents=True, exist_ok=True)
+    index.save(path)
+    print(f"[OK] {len(index)} clubs indexed ({path.stat().st_size:,} bytes)")
+    print(f"Output: {path}")
+
+
+if __name__ == "__main__":
+    main()
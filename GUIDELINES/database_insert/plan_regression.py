@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression harness against a local PostgreSQL stand-in
+Builds the schema from the repo's SQL files in a scratch database, loads the
+seed data plus synthetic volume, runs the app's hot queries under
+EXPLAIN (ANALYZE, BUFFERS) and compares plans and latency with a stored baseline.
+
+Requires a local PostgreSQL (13+) and psycopg2:
+    pip install psycopg2-binary
+
+plan_baseline.json is committed next to this script, recorded at the default
+scale; it notes the PostgreSQL version and machine it came from. Latency
+limits are relative, so re-record it (and commit the result) when a change
+is expected to move plans, or when comparing on very different hardware.
+A baseline only applies to runs at the scale it was recorded at.
+
+Usage:
+    python plan_regression.py --update-baseline      # record plan_baseline.json
+    python plan_regression.py                        # compare against it
+    python plan_regression.py --dsn "host=localhost user=postgres" --scale 2 --baseline FILE
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from schema_index_advisor import MIGRATIONS_DIR, split_statements
+from seed_sql import SEED_DIR, load_seed_tables
+
+DEFAULT_DSN = os.environ.get('PLAN_HARNESS_DSN', 'dbname=postgres')
+DEFAULT_DATABASE = 'golfx_plan_harness'
+BASELINE_PATH = SEED_DIR / 'plan_baseline.json'
+
+# schema-extended.sql is MySQL dialect (inline INDEX clauses), so it is not applied
+SCHEMA_FILES = [
+    SEED_DIR / 'supabase-schema.sql',
+    SEED_DIR / 'supabase-schema-images.sql',
+]
+
+# Objects Supabase provides (auth, storage, roles) and the profile tables the
+# schema files expect to exist already
+SUPABASE_STANDIN_SQL = """
+DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN
+        CREATE ROLE authenticated NOLOGIN;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+        CREATE ROLE anon NOLOGIN;
+    END IF;
+END $$;
+
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS $$ SELECT NULL::uuid $$;
+
+CREATE SCHEMA IF NOT EXISTS storage;
+CREATE TABLE IF NOT EXISTS storage.buckets (
+    id text PRIMARY KEY,
+    name text NOT NULL,
+    public boolean DEFAULT false,
+    file_size_limit bigint,
+    allowed_mime_types text[]
+);
+CREATE TABLE IF NOT EXISTS storage.objects (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    bucket_id text REFERENCES storage.buckets(id),
+    name text
+);
+CREATE OR REPLACE FUNCTION storage.foldername(name text) RETURNS text[]
+    LANGUAGE sql IMMUTABLE AS $$ SELECT string_to_array(name, '/') $$;
+
+CREATE TABLE IF NOT EXISTS profiles (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    full_name text,
+    email text,
+    avatar_url text,
+    handicap numeric,
+    home_course text,
+    bio text,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS friendships (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    requester_id uuid REFERENCES profiles(id),
+    friend_id uuid REFERENCES profiles(id),
+    status varchar(20) DEFAULT 'pending',
+    created_at timestamptz DEFAULT now()
+);
+"""
+
+# Game tables were created from the dashboard and only exist in the repo as TS
+# types. They reference golf_courses and tee_boxes, so they are applied after
+# the schema files and before the migrations that alter them.
+GAME_STANDIN_SQL = """
+CREATE TABLE IF NOT EXISTS games (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    course_id integer REFERENCES golf_courses(id),
+    creator_user_id uuid REFERENCES profiles(id),
+    game_description text,
+    scoring_format varchar(20) DEFAULT 'match_play',
+    weather_condition varchar(20),
+    status varchar(20) DEFAULT 'setup',
+    num_holes integer DEFAULT 18,
+    created_at timestamptz DEFAULT now(),
+    started_at timestamptz,
+    completed_at timestamptz,
+    notes text,
+    notes_updated_by uuid,
+    notes_updated_at timestamptz
+);
+CREATE TABLE IF NOT EXISTS game_participants (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    game_id uuid REFERENCES games(id) ON DELETE CASCADE,
+    user_id uuid REFERENCES profiles(id),
+    tee_box_id integer REFERENCES tee_boxes(id),
+    handicap_index numeric,
+    course_handicap integer,
+    playing_handicap integer,
+    match_handicap integer,
+    total_strokes integer,
+    total_putts integer,
+    net_score integer,
+    front_nine_strokes integer,
+    back_nine_strokes integer,
+    holes_won integer DEFAULT 0,
+    holes_lost integer DEFAULT 0,
+    holes_halved integer DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS game_hole_scores (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    game_id uuid REFERENCES games(id) ON DELETE CASCADE,
+    user_id uuid REFERENCES profiles(id),
+    hole_number integer NOT NULL,
+    strokes integer,
+    putts integer,
+    hole_par integer NOT NULL,
+    hole_handicap_strokes integer DEFAULT 0,
+    player_match_par integer,
+    net_score integer GENERATED ALWAYS AS (strokes - hole_handicap_strokes) STORED,
+    score_vs_par integer GENERATED ALWAYS AS (strokes - hole_par) STORED,
+    updated_at timestamptz DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS game_statistics (id uuid PRIMARY KEY DEFAULT gen_random_uuid());
+CREATE TABLE IF NOT EXISTS game_invitations (id uuid PRIMARY KEY DEFAULT gen_random_uuid());
+CREATE TABLE IF NOT EXISTS user_statistics (id uuid PRIMARY KEY DEFAULT gen_random_uuid());
+"""
+
+# Synthetic volume on top of the seed rows; {scale} multiplies every count.
+# random() is seeded and ids are derived from row numbers, so every run builds
+# the same data and timings stay comparable with the committed baseline.
+SYNTHETIC_SQL = """
+SELECT setseed(0.42);
+
+INSERT INTO golf_clubs (external_id, slug, name, country_id, region_id, city, latitude, longitude)
+SELECT 'synthetic-' || n, 'synthetic-' || n, 'Synthetic Club ' || n, 1, 1, 'City ' || (n % 200),
+       36 + random() * 7, -9 + random() * 12
+FROM generate_series(1, 2000 * {scale}) n;
+
+INSERT INTO golf_courses (club_id, external_id, name, course_number, par, holes, status)
+SELECT c.id, c.external_id || '-' || k, c.name || ' Course ' || k, k, 72, 18, 'active'
+FROM golf_clubs c CROSS JOIN generate_series(1, 2) k
+WHERE c.external_id LIKE 'synthetic-%';
+
+INSERT INTO tee_boxes (course_id, name, color, gender, course_rating, slope_rating, display_order, is_default)
+SELECT g.id, t.name, t.color, t.gender, 70 + t.n, 120 + t.n * 5, t.n, t.n = 0
+FROM golf_courses g
+CROSS JOIN (VALUES (0, 'Black', 'black', 'male'), (1, 'White', 'white', 'male'),
+                   (2, 'Yellow', 'yellow', 'male'), (3, 'Red', 'red', 'female')) AS t(n, name, color, gender)
+WHERE g.external_id LIKE 'synthetic-%';
+
+INSERT INTO holes (course_id, hole_number, par, handicap_index)
+SELECT g.id, h, (ARRAY[4, 4, 3, 5, 4, 4, 3, 5, 4])[1 + (h - 1) % 9], 1 + ((h * 7) % 18)
+FROM golf_courses g CROSS JOIN generate_series(1, 18) h
+WHERE g.external_id LIKE 'synthetic-%';
+
+INSERT INTO hole_distances (hole_id, tee_box_id, yards, meters)
+SELECT h.id, t.id, 150 + h.par * 80 - t.display_order * 20, (150 + h.par * 80 - t.display_order * 20) * 0.9144
+FROM holes h JOIN tee_boxes t ON t.course_id = h.course_id
+JOIN golf_courses g ON g.id = h.course_id
+WHERE g.external_id LIKE 'synthetic-%';
+
+INSERT INTO course_images (course_id, image_type, title, mime_type, image_data, file_size, display_order, is_primary)
+SELECT g.id, t.image_type, g.name, 'image/jpeg', '\\xffd8ffd9'::bytea, 4, t.n, t.n = 1
+FROM golf_courses g
+CROSS JOIN (VALUES (1, 'aerial'), (2, 'default'), (3, 'green')) AS t(n, image_type)
+WHERE g.external_id LIKE 'synthetic-%';
+
+INSERT INTO profiles (id, full_name, email, handicap)
+SELECT md5('player-' || n)::uuid, 'Player ' || n, 'player' || n || '@example.com', round((random() * 36)::numeric, 1)
+FROM generate_series(1, 5000 * {scale}) n;
+
+INSERT INTO user_sessions (user_id, entry_time, exit_time, current_page, session_duration, page_visits)
+SELECT p.id, t, t + interval '10 minutes', '/home', 600, '{{"/home": 3, "/courses": 1}}'::jsonb
+FROM (SELECT id, row_number() OVER () AS rn FROM profiles) p
+CROSS JOIN LATERAL (
+    -- Referencing p keeps the subquery correlated so every user gets fresh timestamps
+    SELECT now() - (random() * interval '90 days') AS t FROM generate_series(1, 40) WHERE p.id IS NOT NULL
+) s
+WHERE p.rn <= 5000 * {scale};
+
+INSERT INTO games (id, course_id, creator_user_id, status, num_holes, created_at, completed_at)
+SELECT md5('game-' || n)::uuid,
+       c.ids[1 + n % cardinality(c.ids)],
+       p.ids[1 + n % cardinality(p.ids)],
+       CASE WHEN n % 20 = 0 THEN 'active' ELSE 'completed' END,
+       CASE WHEN n % 10 = 0 THEN 9 ELSE 18 END,
+       now() - (n % 365) * interval '1 day',
+       now() - (n % 365) * interval '1 day' + interval '4 hours'
+FROM generate_series(1, 20000 * {scale}) n,
+     (SELECT array_agg(id ORDER BY id) AS ids FROM golf_courses) c,
+     (SELECT array_agg(id ORDER BY id) AS ids FROM profiles) p;
+
+INSERT INTO game_participants (game_id, user_id, tee_box_id, handicap_index, course_handicap,
+                               playing_handicap, match_handicap, total_strokes)
+SELECT g.id, pr.id, t.id, pr.handicap, round(pr.handicap), round(pr.handicap), 0, 72 + round(pr.handicap)
+FROM games g
+JOIN LATERAL (SELECT id FROM tee_boxes WHERE course_id = g.course_id ORDER BY display_order LIMIT 1) t ON true
+CROSS JOIN generate_series(0, 1) k
+CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM profiles) p
+JOIN profiles pr ON pr.id = p.ids[1 + (abs(hashtext(g.id::text)) + k) % cardinality(p.ids)];
+
+INSERT INTO game_hole_scores (game_id, user_id, hole_number, strokes, putts, hole_par, hole_handicap_strokes)
+SELECT gp.game_id, gp.user_id, h, 4 + (h % 3), 2, 4, (h % 2)
+FROM game_participants gp CROSS JOIN generate_series(1, 18) h;
+"""
+
+# Statements that can only fail because the Supabase-managed objects (RLS
+# policies, storage, roles, extensions) are stand-ins here. Any other failure
+# in the schema files or migrations aborts the build.
+SUPABASE_ONLY = re.compile(
+    r'^\s*(CREATE|ALTER|DROP)\s+POLICY\b|ROW\s+LEVEL\s+SECURITY|\bstorage\.'
+    r'|^\s*(GRANT|REVOKE)\b|^\s*CREATE\s+EXTENSION\b',
+    re.IGNORECASE
+)
+
+# Parent table of each foreign key column in the seed rows
+SEED_PARENTS = {
+    'country_id': 'countries',
+    'region_id': 'regions',
+    'club_id': 'golf_clubs',
+    'course_id': 'golf_courses',
+    'tee_box_id': 'tee_boxes',
+    'hole_id': 'holes',
+}
+
+# Values the catalogue queries are parameterised with, picked after loading
+FIXTURES = {
+    'course_id': "SELECT id FROM golf_courses ORDER BY id DESC LIMIT 1",
+    'club_id': "SELECT club_id FROM golf_courses ORDER BY id DESC LIMIT 1",
+    'tee_box_id': "SELECT tee_box_id FROM game_participants LIMIT 1",
+    'user_id': "SELECT user_id FROM game_participants LIMIT 1",
+    'game_id': "SELECT game_id FROM game_participants LIMIT 1",
+}
+
+# Hot queries from src/services/data. forbid_seq_scan lists relations that are
+# expected to be reached through an index whatever the baseline says.
+QUERY_CATALOGUE = [
+    {
+        'name': 'course_images_by_course_and_type',
+        'sql': "SELECT id, title, is_primary FROM course_images "
+               "WHERE course_id = %(course_id)s AND image_type = 'default' ORDER BY display_order",
+        'forbid_seq_scan': ['course_images'],
+    },
+    {
+        'name': 'course_images_by_course',
+        'sql': "SELECT id, course_id, hole_id, mime_type, file_size, image_type, title, display_order "
+               "FROM course_images WHERE course_id = %(course_id)s ORDER BY display_order",
+        'forbid_seq_scan': ['course_images'],
+    },
+    {
+        'name': 'tee_boxes_by_course',
+        'sql': "SELECT * FROM tee_boxes WHERE course_id = %(course_id)s ORDER BY display_order",
+        'forbid_seq_scan': ['tee_boxes'],
+    },
+    {
+        'name': 'holes_with_distances',
+        'sql': "SELECT h.*, d.tee_box_id, d.yards, d.meters FROM holes h "
+               "LEFT JOIN hole_distances d ON d.hole_id = h.id "
+               "WHERE h.course_id = %(course_id)s ORDER BY h.hole_number",
+        'forbid_seq_scan': ['holes', 'hole_distances'],
+    },
+    {
+        'name': 'club_amenities_by_club',
+        'sql': "SELECT * FROM club_amenities WHERE club_id = %(club_id)s",
+        'forbid_seq_scan': [],
+    },
+    {
+        'name': 'user_sessions_recent',
+        'sql': "SELECT id, user_id, entry_time, session_duration FROM user_sessions "
+               "ORDER BY entry_time DESC LIMIT 50",
+        'forbid_seq_scan': ['user_sessions'],
+    },
+    {
+        'name': 'user_sessions_last_day',
+        'sql': "SELECT count(*) FROM user_sessions WHERE entry_time > now() - interval '1 day'",
+        'forbid_seq_scan': ['user_sessions'],
+    },
+    {
+        'name': 'user_sessions_by_user',
+        'sql': "SELECT * FROM user_sessions WHERE user_id = %(user_id)s ORDER BY entry_time DESC LIMIT 20",
+        'forbid_seq_scan': ['user_sessions'],
+    },
+    {
+        'name': 'active_games_for_user',
+        'sql': "SELECT g.* FROM games g JOIN game_participants gp ON gp.game_id = g.id "
+               "WHERE gp.user_id = %(user_id)s AND g.status = 'active' ORDER BY g.created_at DESC",
+        'forbid_seq_scan': [],
+    },
+    {
+        'name': 'hole_scores_for_player',
+        'sql': "SELECT * FROM game_hole_scores WHERE game_id = %(game_id)s "
+               "AND user_id = %(user_id)s ORDER BY hole_number",
+        'forbid_seq_scan': [],
+    },
+    {
+        'name': 'course_leaderboard_by_tee',
+        'sql': "SELECT gp.user_id, gp.total_strokes FROM games g "
+               "JOIN game_participants gp ON gp.game_id = g.id "
+               "WHERE g.course_id = %(course_id)s AND gp.tee_box_id = %(tee_box_id)s "
+               "AND g.status = 'completed' AND g.num_holes IN (9, 18) ORDER BY gp.total_strokes LIMIT 10",
+        'forbid_seq_scan': [],
+    },
+]
+
+
+def connect(dsn, dbname=None, autocommit=True):
+    try:
+        import psycopg2
+        from psycopg2.extensions import make_dsn
+    except ImportError:
+        print("[ERROR] psycopg2 not installed (pip install psycopg2-binary)")
+        sys.exit(2)
+    conn = psycopg2.connect(make_dsn(dsn, dbname=dbname) if dbname else dsn)
+    conn.autocommit = autocommit
+    return conn
+
+
+def recreate_database(admin_dsn, database):
+    conn = connect(admin_dsn)
+    with conn.cursor() as cur:
+        cur.execute(f'DROP DATABASE IF EXISTS "{database}"')
+        cur.execute(f'CREATE DATABASE "{database}"')
+    conn.close()
+
+
+def drop_database(admin_dsn, database):
+    conn = connect(admin_dsn)
+    with conn.cursor() as cur:
+        cur.execute(f'DROP DATABASE IF EXISTS "{database}"')
+    conn.close()
+
+
+def fail(label, statement, error):
+    print(f"[ERROR] {label}: {statement.splitlines()[0][:70]} -> {str(error).splitlines()[0]}")
+    sys.exit(1)
+
+
+def run_sql(conn, sql, label, tolerate=None, require_rows=False):
+    """
+    Execute statements one by one and stop at the first failure. Failures of
+    statements matching `tolerate` are reported and skipped instead, and with
+    `require_rows` an INSERT that loads no rows counts as a failure.
+    Returns the number of skipped statements.
+    """
+    skipped = 0
+    with conn.cursor() as cur:
+        for statement in split_statements(sql):
+            try:
+                cur.execute(statement)
+            except Exception as e:
+                if not (tolerate and tolerate.search(statement)):
+                    fail(label, statement, e)
+                skipped += 1
+                first_line = statement.splitlines()[0][:70]
+                print(f"  [SKIP] {label}: {first_line} -> {str(e).splitlines()[0][:80]}")
+                continue
+            if require_rows and statement.upper().startswith('INSERT') and cur.rowcount == 0:
+                fail(label, statement, "no rows inserted")
+    return skipped
+
+
+def load_seed(conn):
+    """
+    Insert the seed rows parsed by seed_sql. Rows pointing at a parent the seed
+    does not define (hole distances for tee boxes missing from 05_tee_boxes.sql)
+    are left out with a warning; any other error aborts the build.
+    """
+    tables = load_seed_tables()
+    with conn.cursor() as cur:
+        for table, rows in tables.items():
+            dropped = 0
+            for row in rows.values():
+                if any(row.get(column) is not None and row[column] not in tables.get(parent, {})
+                       for column, parent in SEED_PARENTS.items()):
+                    dropped += 1
+                    continue
+                statement = (f"INSERT INTO {table} ({', '.join(row)}) "
+                             f"VALUES ({', '.join(['%s'] * len(row))})")
+                try:
+                    cur.execute(statement, list(row.values()))
+                except Exception as e:
+                    fail(table, statement, e)
+            if dropped:
+                print(f"  [WARNING] {table}: {dropped} seed rows reference ids missing from the seed")
+            # Seed rows carry explicit ids, so move the serial past them
+            cur.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), max(id)) FROM {table}")
+
+
+def build_database(conn, scale):
+    print("Applying Supabase stand-in objects...")
+    run_sql(conn, SUPABASE_STANDIN_SQL, 'stand-in')
+
+    for path in SCHEMA_FILES:
+        print(f"Applying {path.name}...")
+        run_sql(conn, path.read_text(encoding='utf-8'), path.name, tolerate=SUPABASE_ONLY)
+
+    print("Applying game table stand-ins...")
+    run_sql(conn, GAME_STANDIN_SQL, 'game stand-in')
+
+    for path in sorted(MIGRATIONS_DIR.glob('*.sql')):
+        print(f"Applying {path.name}...")
+        run_sql(conn, path.read_text(encoding='utf-8'), path.name, tolerate=SUPABASE_ONLY)
+
+    print("Loading seed data...")
+    load_seed(conn)
+
+    print(f"Generating synthetic volume (scale {scale})...")
+    start = time.perf_counter()
+    run_sql(conn, SYNTHETIC_SQL.format(scale=scale), 'synthetic', require_rows=True)
+    with conn.cursor() as cur:
+        # VACUUM sets the visibility map, so index-only scans do not depend on
+        # whether autovacuum happened to run before the timings
+        cur.execute('VACUUM ANALYZE')
+    print(f"  done in {time.perf_counter() - start:.1f}s")
+
+
+def resolve_fixtures(conn):
+    params = {}
+    with conn.cursor() as cur:
+        for name, sql in FIXTURES.items():
+            cur.execute(sql)
+            row = cur.fetchone()
+            params[name] = row[0] if row else None
+    return params
+
+
+def walk_plan(node, scans):
+    """Collect {relation: node_type} for every scan node in the plan tree"""
+    relation = node.get('Relation Name')
+    if relation:
+        scans.setdefault(relation, node['Node Type'])
+    for child in node.get('Plans', []):
+        walk_plan(child, scans)
+    return scans
+
+
+def explain(conn, query, params, runs):
+    """Run EXPLAIN (ANALYZE, BUFFERS) `runs` times; return plan summary and median latency"""
+    timings = []
+    plan = None
+    with conn.cursor() as cur:
+        for _ in range(runs):
+            cur.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + query['sql'], params)
+            result = cur.fetchone()[0]
+            result = result[0] if isinstance(result, list) else json.loads(result)[0]
+            timings.append(result['Execution Time'])
+            plan = result['Plan']
+    return {
+        'scans': walk_plan(plan, {}),
+        'root': plan['Node Type'],
+        'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+        'median_ms': round(statistics.median(timings), 3),
+    }
+
+
+def compare(name, current, baseline, query, threshold, min_delta_ms):
+    """Return a list of failure messages for one query"""
+    failures = []
+    for relation in query['forbid_seq_scan']:
+        if current['scans'].get(relation) == 'Seq Scan':
+            failures.append(f"{name}: Seq Scan on {relation}")
+
+    if baseline is None:
+        return failures
+
+    for relation, node_type in current['scans'].items():
+        before = baseline['scans'].get(relation)
+        if node_type == 'Seq Scan' and before and before != 'Seq Scan':
+            message = f"{name}: {relation} changed from {before} to Seq Scan"
+            if message not in failures and f"{name}: Seq Scan on {relation}" not in failures:
+                failures.append(message)
+
+    limit = baseline['median_ms'] * (1 + threshold)
+    if current['median_ms'] > limit and current['median_ms'] - baseline['median_ms'] > min_delta_ms:
+        failures.append(
+            f"{name}: {current['median_ms']:.3f} ms vs baseline {baseline['median_ms']:.3f} ms "
+            f"(+{(current['median_ms'] / baseline['median_ms'] - 1) * 100:.0f}%)"
+        )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dsn', default=DEFAULT_DSN,
+                        help="Maintenance connection used to create the scratch database")
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--scale', type=int, default=1, help="Synthetic volume multiplier")
+    parser.add_argument('--runs', type=int, default=5, help="EXPLAIN ANALYZE runs per query")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="Allowed latency regression as a fraction (0.5 = +50%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help="Ignore regressions smaller than this many milliseconds")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch database")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("QUERY PLAN REGRESSION HARNESS")
+    print("=" * 60)
+
+    # Check the baseline before spending minutes building the database
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        recorded = json.loads(args.baseline.read_text(encoding='utf-8'))
+        if recorded['scale'] != args.scale:
+            print(f"[ERROR] {args.baseline} was recorded at scale {recorded['scale']}, "
+                  f"this run uses scale {args.scale}")
+            print("Run at the baseline's scale or pass --baseline with one for this scale")
+            sys.exit(2)
+        print(f"Baseline: scale {recorded['scale']}, PostgreSQL {recorded.get('postgres', '?')} "
+              f"on {recorded.get('machine', '?')}")
+        baseline = recorded['queries']
+    elif not args.update_baseline:
+        print(f"[WARNING] No baseline at {args.baseline} - only absolute checks run")
+
+    recreate_database(args.dsn, args.database)
+    conn = connect(args.dsn, dbname=args.database)
+    failures = []
+    results = {}
+    try:
+        build_database(conn, args.scale)
+        with conn.cursor() as cur:
+            # Keep timings comparable between runs and machines
+            cur.execute('SET max_parallel_workers_per_gather = 0')
+            cur.execute('SET jit = off')
+            cur.execute('SHOW server_version')
+            server_version = cur.fetchone()[0]
+        params = resolve_fixtures(conn)
+
+        print("\n" + "-" * 60)
+        for query in QUERY_CATALOGUE:
+            current = explain(conn, query, params, args.runs)
+            results[query['name']] = current
+            query_failures = compare(query['name'], current, baseline.get(query['name']),
+                                     query, args.threshold, args.min_delta_ms)
+            failures.extend(query_failures)
+            scans = ', '.join(f"{r}:{t}" for r, t in sorted(current['scans'].items()))
+            status = '[FAIL]' if query_failures else '[OK]'
+            print(f"{status} {query['name']}: {current['median_ms']:.3f} ms  ({scans})")
+    finally:
+        conn.close()
+        if not args.keep:
+            drop_database(args.dsn, args.database)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps({
+            'scale': args.scale,
+            'postgres': server_version,
+            'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+            'queries': results,
+        }, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+        print(f"\nBaseline saved to {args.baseline}")
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"RESULTS: {len(failures)} regression(s)")
+        for failure in failures:
+            print(f"  [!] {failure}")
+        sys.exit(1)
+    print(f"RESULTS: {len(results)} queries OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Audit foreign keys and query filter columns against declared indexes
+Replays the DDL files in migration order, collects the .eq()/.order()/...
+column usage from src/services/data/*.ts and reports missing, redundant and
+prefix-duplicate indexes with suggested DDL.
+
+Usage: python schema_index_advisor.py [--sql OUT.sql] [--json]
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from seed_sql import SEED_DIR, strip_comments
+
+REPO_ROOT = SEED_DIR.parent.parent
+
+# Base schema first, then the dated migrations (sorted by filename)
+SCHEMA_FILES = [
+    SEED_DIR / 'supabase-schema.sql',
+    SEED_DIR / 'schema-extended.sql',
+    SEED_DIR / 'supabase-schema-images.sql',
+]
+MIGRATIONS_DIR = REPO_ROOT / 'supabase' / 'migrations'
+SERVICES_DIR = REPO_ROOT / 'src' / 'services' / 'data'
+
+EQUALITY_OPS = {'eq', 'in', 'is'}
+RANGE_OPS = {'gt', 'gte', 'lt', 'lte', 'neq'}
+PATTERN_OPS = {'like', 'ilike'}
+
+IDENT = r'(?:"?[\w]+"?\.)?"?(\w+)"?'
+
+
+def schema_files():
+    """DDL files in the order they are applied"""
+    return SCHEMA_FILES + sorted(MIGRATIONS_DIR.glob('*.sql'))
+
+
+# ============================================
+# DDL parsing
+# ============================================
+
+def split_statements(sql):
+    """Split SQL on top-level semicolons, honouring quotes and $$ bodies"""
+    sql = strip_comments(sql)
+    statements = []
+    start = 0
+    i = 0
+    while i < len(sql):
+        ch = sql[i]
+        if ch == "'":
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == "'" and sql[end + 1:end + 2] == "'":
+                    end += 2
+                    continue
+                if sql[end] == "'":
+                    break
+                end += 1
+            i = end + 1
+            continue
+        if ch == '$':
+            tag = re.match(r'\$\w*\$', sql[i:])
+            if tag:
+                close = sql.find(tag.group(0), i + len(tag.group(0)))
+                i = len(sql) if close == -1 else close + len(tag.group(0))
+                continue
+        if ch == ';':
+            statements.append(sql[start:i].strip())
+            start = i + 1
+        i += 1
+    tail = sql[start:].strip()
+    if tail:
+        statements.append(tail)
+    return [s for s in statements if s]
+
+
+def split_top_level(body):
+    """Split a parenthesised body on commas that are not nested"""
+    parts = []
+    depth = 0
+    token = []
+    in_string = False
+    for ch in body:
+        if ch == "'":
+            in_string = not in_string
+        if not in_string:
+            if ch == '(':
+                depth += 1
+            elif ch == ')':
+                depth -= 1
+            elif ch == ',' and depth == 0:
+                parts.append(''.join(token).strip())
+                token = []
+                continue
+        token.append(ch)
+    if ''.join(token).strip():
+        parts.append(''.join(token).strip())
+    return parts
+
+
+def paren_body(text, start):
+    """Return (body, end) for the parenthesised group opening at/after start"""
+    open_pos = text.index('(', start)
+    depth = 0
+    for i in range(open_pos, len(text)):
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return text[open_pos + 1:i], i + 1
+    raise ValueError("Unbalanced parentheses")
+
+
+def index_columns(body):
+    """
+    Turn an index column list into plain column names.
+    Expressions (to_tsvector(...), lower(...)) are kept as '(expr)' so they
+    never match a plain column lookup.
+    """
+    columns = []
+    for part in split_top_level(body):
+        part = re.sub(r'\s+(ASC|DESC)\b.*$', '', part, flags=re.IGNORECASE)
+        part = re.sub(r'\s+NULLS\s+(FIRST|LAST)$', '', part, flags=re.IGNORECASE)
+        match = re.fullmatch(r'"?(\w+)"?', part.strip())
+        columns.append(match.group(1).lower() if match else f'({part.strip()})')
+    return columns
+
+
+def new_table(name, declared=True):
+    return {
+        'name': name,
+        'declared': declared,
+        'columns': {},
+        'foreign_keys': [],
+    }
+
+
+def declare_external(schema, table, source):
+    """Track a table whose CREATE TABLE lives outside the repo (Supabase dashboard)"""
+    schema['tables'][table] = new_table(table, declared=False)
+    # Every app table has a surrogate id primary key
+    add_index(schema, table, f'{table}_pkey', ['id'], source, unique=True, implicit=True)
+
+
+def add_index(schema, table, name, columns, source, unique=False,
+              method='btree', implicit=False, mysql_inline=False):
+    schema['indexes'][name] = {
+        'name': name,
+        'table': table,
+        'columns': columns,
+        'unique': unique,
+        'method': method,
+        'implicit': implicit,
+        'mysql_inline': mysql_inline,
+        'source': source,
+    }
+
+
+def parse_column_def(schema, table, item, source):
+    """Handle a single column definition inside CREATE TABLE / ADD COLUMN"""
+    match = re.match(r'"?(\w+)"?\s+(.*)$', item, re.DOTALL)
+    if not match:
+        return
+    column = match.group(1).lower()
+    definition = match.group(2)
+    tables = schema['tables']
+    tables[table]['columns'][column] = definition.split()[0].lower()
+
+    if re.search(r'\bPRIMARY\s+KEY\b', definition, re.IGNORECASE):
+        add_index(schema, table, f'{table}_pkey', [column], source,
+                  unique=True, implicit=True)
+    elif re.search(r'\bUNIQUE\b', definition, re.IGNORECASE):
+        add_index(schema, table, f'{table}_{column}_key', [column], source,
+                  unique=True, implicit=True)
+
+    ref = re.search(r'\bREFERENCES\s+' + IDENT + r'\s*\(\s*"?(\w+)"?\s*\)',
+                    definition, re.IGNORECASE)
+    if ref:
+        tables[table]['foreign_keys'].append({
+            'columns': [column],
+            'ref_table': ref.group(1).lower(),
+            'ref_columns': [ref.group(2).lower()],
+            'source': source,
+        })
+
+
+def parse_create_table(schema, statement, source):
+    match = re.match(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?' + IDENT,
+                     statement, re.IGNORECASE)
+    table = match.group(1).lower()
+    body, _ = paren_body(statement, match.end())
+    schema['tables'][table] = new_table(table)
+
+    for item in split_top_level(body):
+        item = re.sub(r'^CONSTRAINT\s+\w+\s+', '', item, flags=re.IGNORECASE)
+        upper = item.upper()
+        if upper.startswith('PRIMARY KEY'):
+            cols = index_columns(paren_body(item, 0)[0])
+            add_index(schema, table, f'{table}_pkey', cols, source,
+                      unique=True, implicit=True)
+        elif upper.startswith('UNIQUE'):
+            # UNIQUE (a, b) or MySQL-style UNIQUE KEY name (a, b)
+            named = re.match(r'UNIQUE\s+(?:KEY|INDEX)\s+(\w+)', item, re.IGNORECASE)
+            cols = index_columns(paren_body(item, 0)[0])
+            name = named.group(1) if named else f"{table}_{'_'.join(cols)}_key"
+            add_index(schema, table, name, cols, source, unique=True,
+                      implicit=not named, mysql_inline=bool(named))
+        elif re.match(r'(FULLTEXT\s+)?(INDEX|KEY)\s+\w+\s*\(', item, re.IGNORECASE):
+            named = re.match(r'(?:FULLTEXT\s+)?(?:INDEX|KEY)\s+(\w+)', item, re.IGNORECASE)
+            cols = index_columns(paren_body(item, 0)[0])
+            method = 'fulltext' if upper.startswith('FULLTEXT') else 'btree'
+            add_index(schema, table, named.group(1), cols, source,
+                      method=method, mysql_inline=True)
+        elif upper.startswith('FOREIGN KEY'):
+            cols = index_columns(paren_body(item, 0)[0])
+            ref = re.search(r'REFERENCES\s+' + IDENT + r'\s*\(([^)]*)\)', item, re.IGNORECASE)
+            schema['tables'][table]['foreign_keys'].append({
+                'columns': cols,
+                'ref_table': ref.group(1).lower(),
+                'ref_columns': index_columns(ref.group(2)),
+                'source': source,
+            })
+        elif upper.startswith(('CHECK', 'EXCLUDE')):
+            continue
+        else:
+            parse_column_def(schema, table, item, source)
+
+
+def parse_alter_table(schema, statement, source):
+    match = re.match(r'ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?' + IDENT,
+                     statement, re.IGNORECASE)
+    table = match.group(1).lower()
+    if table not in schema['tables']:
+        # Tables created outside the repo (games, profiles, ...) still get tracked
+        declare_external(schema, table, source)
+
+    for action in split_top_level(statement[match.end():]):
+        add = re.match(r'ADD\s+COLUMN\s+(?:IF\s+NOT\s+EXISTS\s+)?(.*)$',
+                       action, re.IGNORECASE | re.DOTALL)
+        drop = re.match(r'DROP\s+COLUMN\s+(?:IF\s+EXISTS\s+)?"?(\w+)"?',
+                        action, re.IGNORECASE)
+        if add:
+            parse_column_def(schema, table, add.group(1), source)
+        elif drop:
+            column = drop.group(1).lower()
+            schema['tables'][table]['columns'].pop(column, None)
+            # Postgres drops every index that uses the column
+            for name in [n for n, idx in schema['indexes'].items()
+                         if idx['table'] == table and column in idx['columns']]:
+                del schema['indexes'][name]
+
+
+def parse_create_index(schema, statement, source):
+    match = re.match(
+        r'CREATE\s+(UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?'
+        r'"?(\w+)"?\s+ON\s+(?:ONLY\s+)?' + IDENT + r'\s*(?:USING\s+(\w+)\s*)?',
+        statement, re.IGNORECASE
+    )
+    if not match:
+        return
+    name = match.group(2)
+    if 'IF NOT EXISTS' in statement.upper() and name in schema['indexes']:
+        return
+    body, _ = paren_body(statement, match.end())
+    add_index(schema, match.group(3).lower(), name, index_columns(body), source,
+              unique=bool(match.group(1)),
+              method=(match.group(4) or 'btree').lower())
+
+
+def build_schema(files=None):
+    """Replay DDL files into {'tables': {...}, 'indexes': {...}}"""
+    schema = {'tables': {}, 'indexes': {}}
+    for path in files or schema_files():
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        source = Path(path).name
+        for statement in split_statements(content):
+            upper = re.sub(r'\s+', ' ', statement[:80].upper())
+            if upper.startswith('CREATE TABLE'):
+                parse_create_table(schema, statement, source)
+            elif upper.startswith('ALTER TABLE'):
+                parse_alter_table(schema, statement, source)
+            elif re.match(r'CREATE (UNIQUE )?INDEX', upper):
+                parse_create_index(schema, statement, source)
+            elif upper.startswith('DROP INDEX'):
+                for name in re.findall(r'"?(\w+)"?\s*(?:,|$)',
+                                       re.sub(r'^DROP INDEX\s+(CONCURRENTLY\s+)?(IF EXISTS\s+)?',
+                                              '', statement, flags=re.IGNORECASE)):
+                    schema['indexes'].pop(name, None)
+            elif upper.startswith('DROP TABLE'):
+                for table in re.findall(r'(\w+)\s*(?:,|$|CASCADE)', statement[10:]):
+                    table = table.lower()
+                    schema['tables'].pop(table, None)
+                    schema['indexes'] = {n: i for n, i in schema['indexes'].items()
+                                         if i['table'] != table}
+    return schema
+
+
+# ============================================
+# Query usage (supabase-js call chains)
+# ============================================
+
+FROM_PATTERN = re.compile(r"\.from\(\s*['\"](\w+)['\"]\s*\)")
+FILTER_PATTERN = re.compile(
+    r"\.(eq|neq|gt|gte|lt|lte|in|is|like|ilike|order)\(\s*['\"]([\w.]+)['\"]"
+)
+OR_PATTERN = re.compile(r"\.or\(\s*[`'\"]([^`'\"]*)[`'\"]")
+OR_TERM_PATTERN = re.compile(r'(\w+(?:\.\w+)?)\.(eq|neq|gt|gte|lt|lte|in|is|like|ilike)\.')
+
+
+def collect_usage(services_dir=SERVICES_DIR):
+    """
+    Return a list of queries: {table, site, filters: {table: {eq, range, order, pattern, or}}}.
+    Filters on embedded resources ('games.status') are attributed to that table.
+    Terms inside .or() are alternatives, so each one needs its own index.
+    """
+    queries = []
+    for path in sorted(Path(services_dir).glob('*.ts')):
+        text = path.read_text(encoding='utf-8')
+        starts = list(FROM_PATTERN.finditer(text))
+        for n, start in enumerate(starts):
+            end = starts[n + 1].start() if n + 1 < len(starts) else len(text)
+            segment = text[start.end():end]
+            root = start.group(1)
+            line = text.count('\n', 0, start.start()) + 1
+            filters = {}
+
+            def record(path_expr, op, alternative=False):
+                table, _, column = path_expr.rpartition('.')
+                table = table or root
+                bucket = filters.setdefault(table, {
+                    'eq': [], 'range': [], 'order': [], 'pattern': [], 'or': []
+                })
+                kind = ('pattern' if op in PATTERN_OPS else
+                        'or' if alternative else
+                        'eq' if op in EQUALITY_OPS else
+                        'range' if op in RANGE_OPS else 'order')
+                if column not in bucket[kind]:
+                    bucket[kind].append(column)
+
+            for match in FILTER_PATTERN.finditer(segment):
+                record(match.group(2), match.group(1))
+            for match in OR_PATTERN.finditer(segment):
+                for term in OR_TERM_PATTERN.finditer(match.group(1)):
+                    record(term.group(1), term.group(2), alternative=True)
+
+            queries.append({
+                'table': root,
+                'site': f'{path.name}:{line}',
+                'filters': filters,
+            })
+    return queries
+
+
+# ============================================
+# Analysis
+# ============================================
+
+def table_indexes(schema, table):
+    return [i for i in schema['indexes'].values()
+            if i['table'] == table and i['method'] == 'btree']
+
+
+def leading_columns(schema, table):
+    return {i['columns'][0] for i in table_indexes(schema, table) if i['columns']}
+
+
+def suggestion_name(table, columns):
+    return f"idx_{table}_{'_'.join(columns)}"
+
+
+def find_missing(schema, queries):
+    """FK columns and query filters with no index on a leading column"""
+    suggestions = {}
+
+    def suggest(table, columns, reason, site):
+        key = (table, tuple(columns))
+        entry = suggestions.setdefault(key, {
+            'table': table,
+            'columns': list(columns),
+            'reasons': [],
+            'sites': [],
+            'declared': table in schema['tables'] and schema['tables'][table]['declared'],
+        })
+        if reason not in entry['reasons']:
+            entry['reasons'].append(reason)
+        if site and site not in entry['sites']:
+            entry['sites'].append(site)
+
+    for table in schema['tables'].values():
+        leading = leading_columns(schema, table['name'])
+        for fk in table['foreign_keys']:
+            if fk['columns'][0] not in leading:
+                suggest(table['name'], fk['columns'],
+                        f"foreign key -> {fk['ref_table']}({', '.join(fk['ref_columns'])})",
+                        fk['source'])
+
+    for query in queries:
+        for table, f in query['filters'].items():
+            leading = leading_columns(schema, table)
+            # A BitmapOr needs every branch indexed, otherwise it falls back to a seq scan
+            for column in f['or']:
+                if column not in leading:
+                    suggest(table, [column], f'or-branch {column} =', query['site'])
+            if not f['eq'] and not f['range']:
+                continue
+            if leading & set(f['eq'] + f['range'][:1]):
+                continue
+            # Equality columns first, then one range/sort column
+            columns = list(f['eq'])
+            tail = (f['range'] + [c for c in f['order'] if c not in columns])[:1]
+            columns += [c for c in tail if c not in columns]
+            suggest(table, columns, 'filter ' + ', '.join(
+                [f'{c} =' for c in f['eq']] + [f'{c} range' for c in f['range']] +
+                [f'order by {c}' for c in f['order']]
+            ), query['site'])
+
+    # A suggestion that is a prefix of another one is served by the longer index
+    result = []
+    for key, entry in suggestions.items():
+        table, columns = key
+        if any(other[0] == table and other != key and other[1][:len(columns)] == columns
+               for other in suggestions):
+            continue
+        result.append(entry)
+    return sorted(result, key=lambda e: (e['table'], e['columns']))
+
+
+def find_redundant(schema):
+    """Indexes with identical columns, or whose columns are a prefix of another"""
+    findings = []
+    by_table = {}
+    for index in schema['indexes'].values():
+        if index['method'] == 'btree':
+            by_table.setdefault(index['table'], []).append(index)
+
+    seen = set()
+    for table, indexes in sorted(by_table.items()):
+        for a in indexes:
+            for b in indexes:
+                if a is b or a['implicit'] or a['name'] in seen:
+                    continue
+                # Never drop a unique index in favour of a plain one
+                if a['unique'] and not b['unique']:
+                    continue
+                if a['columns'] == b['columns']:
+                    if b['name'] in seen:
+                        continue
+                    kind = 'redundant'
+                elif (len(a['columns']) < len(b['columns'])
+                      and b['columns'][:len(a['columns'])] == a['columns']
+                      and not a['unique']):
+                    kind = 'prefix-duplicate'
+                else:
+                    continue
+                seen.add(a['name'])
+                findings.append({'kind': kind, 'index': a, 'covered_by': b})
+    return findings
+
+
+def find_mysql_inline(schema):
+    """Inline INDEX / UNIQUE KEY clauses that PostgreSQL rejects"""
+    return sorted((i for i in schema['indexes'].values() if i['mysql_inline']),
+                  key=lambda i: (i['source'], i['table'], i['name']))
+
+
+def create_index_sql(table, columns, name=None, unique=False):
+    return (f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+            f"{name or suggestion_name(table, columns)} ON {table}({', '.join(columns)});")
+
+
+# ============================================
+# Reporting
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sql', type=Path, help="Write suggested DDL to this file")
+    parser.add_argument('--json', action='store_true', help="Print findings as JSON")
+    args = parser.parse_args(argv)
+
+    schema = build_schema()
+    queries = collect_usage()
+    missing = find_missing(schema, queries)
+    redundant = find_redundant(schema)
+    mysql_inline = find_mysql_inline(schema)
+
+    ddl = []
+    for entry in missing:
+        ddl.append(create_index_sql(entry['table'], entry['columns']))
+    # Inline MySQL indexes never got created, so redundant ones are just skipped
+    skipped = set()
+    for finding in redundant:
+        if finding['index']['mysql_inline']:
+            skipped.add(finding['index']['name'])
+        else:
+            ddl.append(f"DROP INDEX IF EXISTS {finding['index']['name']};")
+    for index in mysql_inline:
+        if index['method'] == 'btree' and index['name'] not in skipped:
+            ddl.append(create_index_sql(index['table'], index['columns'],
+                                        index['name'], index['unique']))
+
+    if args.json:
+        print(json.dumps({
+            'missing': missing,
+            'redundant': [{'kind': f['kind'], 'index': f['index']['name'],
+                           'covered_by': f['covered_by']['name']} for f in redundant],
+            'mysql_inline': [i['name'] for i in mysql_inline],
+            'ddl': ddl,
+        }, indent=2))
+    else:
+        print("=== Schema Index Advisor ===")
+        print(f"{len(schema['tables'])} tables, {len(schema['indexes'])} indexes, "
+              f"{len(queries)} queries in {SERVICES_DIR.relative_to(REPO_ROOT)}")
+
+        print(f"\n=== Missing Indexes ({len(missing)}) ===")
+        for entry in missing:
+            note = '' if entry['declared'] else ' (table not declared in repo DDL)'
+            print(f"[!] {entry['table']}({', '.join(entry['columns'])}){note}")
+            for reason in entry['reasons']:
+                print(f"    - {reason}")
+            print(f"    seen in: {', '.join(entry['sites'])}")
+            print(f"    {create_index_sql(entry['table'], entry['columns'])}")
+
+        print(f"\n=== Redundant Indexes ({len(redundant)}) ===")
+        for finding in redundant:
+            index, other = finding['index'], finding['covered_by']
+            print(f"[!] {finding['kind']}: {index['name']} ({', '.join(index['columns'])}) "
+                  f"covered by {other['name']} ({', '.join(other['columns'])})")
+            if not index['mysql_inline']:
+                print(f"    DROP INDEX IF EXISTS {index['name']};")
+
+        print(f"\n=== MySQL-style Inline Indexes ({len(mysql_inline)}) ===")
+        for index in mysql_inline:
+            print(f"[!] {index['source']}: {index['table']}.{index['name']} "
+                  f"({', '.join(index['columns'])}) is not valid PostgreSQL")
+
+        if not (missing or redundant or mysql_inline):
+            print("\n[OK] No index issues found")
+
+    if args.sql:
+        args.sql.write_text('-- Generated by schema_index_advisor.py\n' +
+                            '\n'.join(ddl) + '\n', encoding='utf-8')
+        print(f"\nSuggested DDL saved to {args.sql}")
+
+    sys.exit(1 if missing or redundant else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Minimal parser for the seed INSERT files in this directory
+Turns `INSERT INTO table (cols) VALUES (...), (...)` statements into row dicts
+"""
+
+import re
+from pathlib import Path
+
+SEED_DIR = Path(__file__).parent
+
+# Seed files in load order. 06_holes.sql / 07_hole_distances.sql only hold
+# course 1, so the per-course files are used instead (they are a superset).
+SEED_FILES = [
+    '01_countries.sql',
+    '02_regions.sql',
+    '03_golf_clubs.sql',
+    '04_golf_courses.sql',
+    '05_tee_boxes.sql',
+    '06_holes_course1.sql',
+    '06_holes_course2.sql',
+    '06_holes_course3.sql',
+    '06_holes_course4.sql',
+    '06_holes_course5.sql',
+    '07_hole_distances_course1.sql',
+    '07_hole_distances_course2.sql',
+    '07_hole_distances_course3.sql',
+    '07_hole_distances_course4.sql',
+    '07_hole_distances_course5.sql',
+    '08_club_amenities.sql',
+]
+
+INSERT_PATTERN = re.compile(
+    r'INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s*',
+    re.IGNORECASE
+)
+
+NUMBER_PATTERN = re.compile(r'^-?\d+(\.\d+)?$')
+
+
+def strip_comments(sql):
+    """Remove `--` line comments while leaving quoted strings untouched"""
+    out = []
+    i = 0
+    in_string = False
+    while i < len(sql):
+        ch = sql[i]
+        if in_string:
+            out.append(ch)
+            if ch == "'":
+                if sql[i + 1:i + 2] == "'":
+                    out.append("'")
+                    i += 1
+                else:
+                    in_string = False
+        elif ch == "'":
+            in_string = True
+            out.append(ch)
+        elif sql.startswith('--', i):
+            newline = sql.find('\n', i)
+            if newline == -1:
+                break
+            i = newline
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def parse_literal(token):
+    """Convert a single SQL literal into the matching Python value"""
+    token = token.strip()
+    upper = token.upper()
+    if upper == 'NULL':
+        return None
+    if upper == 'TRUE':
+        return True
+    if upper == 'FALSE':
+        return False
+    if token.startswith("'") and token.endswith("'"):
+        return token[1:-1].replace("''", "'")
+    if NUMBER_PATTERN.match(token):
+        return float(token) if '.' in token else int(token)
+    # Expressions (sub-selects, casts, function calls) are kept verbatim
+    return token
+
+
+def split_tuples(values_sql):
+    """
+    Split the text after VALUES into tuples of raw literal tokens.
+    Stops at the end of the statement (`;` or ON CONFLICT outside parentheses).
+    Returns (tuples, consumed_length).
+    """
+    tuples = []
+    current = []
+    token = []
+    depth = 0
+    in_string = False
+    i = 0
+    while i < len(values_sql):
+        ch = values_sql[i]
+        if in_string:
+            token.append(ch)
+            if ch == "'":
+                if values_sql[i + 1:i + 2] == "'":
+                    token.append("'")
+                    i += 1
+                else:
+                    in_string = False
+        elif ch == "'":
+            in_string = True
+            token.append(ch)
+        elif ch == '(':
+            depth += 1
+            if depth > 1:
+                token.append(ch)
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                current.append(''.join(token))
+                tuples.append(current)
+                current, token = [], []
+            else:
+                token.append(ch)
+        elif ch == ',' and depth == 1:
+            current.append(''.join(token))
+            token = []
+        elif depth == 0 and (ch == ';' or values_sql[i:i + 2].upper() == 'ON'):
+            break
+        elif depth > 0:
+            token.append(ch)
+        i += 1
+    return tuples, i
+
+
+def parse_inserts(sql):
+    """Yield (table, row_dict) for every VALUES tuple in the SQL text"""
+    sql = strip_comments(sql)
+    pos = 0
+    while True:
+        match = INSERT_PATTERN.search(sql, pos)
+        if not match:
+            return
+        table = match.group(1).lower()
+        columns = [c.strip() for c in match.group(2).split(',')]
+        tuples, consumed = split_tuples(sql[match.end():])
+        for raw in tuples:
+            if len(raw) != len(columns):
+                raise ValueError(
+                    f"{table}: expected {len(columns)} values, got {len(raw)}"
+                )
+            yield table, dict(zip(columns, (parse_literal(v) for v in raw)))
+        pos = match.end() + consumed
+
+
+def load_seed_tables(seed_dir=SEED_DIR, files=SEED_FILES):
+    """
+    Load the seed files into {table: {id: row}}.
+    Rows without an explicit id (hole_distances, club_amenities) get a
+    sequential id in file order, matching what the serial column would assign.
+    The first row for an id wins, matching ON CONFLICT (id) DO NOTHING.
+    """
+    tables = {}
+    for name in files:
+        path = Path(seed_dir) / name
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for table, row in parse_inserts(content):
+            rows = tables.setdefault(table, {})
+            if row.get('id') is None:
+                row['id'] = len(rows) + 1
+            rows.setdefault(row['id'], row)
+    return tables
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Streaming rollup of user_sessions exports into hourly and daily tables
+Reads exported sessions row by row (CSV or NDJSON, optionally gzipped) and
+folds them into per-bucket page visit counts, a t-digest of session
+durations and a HyperLogLog of active users. The sketches are mergeable,
+so each run only adds newly settled sessions to the saved state, and any
+range of buckets can be combined later without the raw rows.
+
+Export the rows changed since the last run (the tool prints the query):
+    \\copy (SELECT id, user_id, entry_time, exit_time, session_duration, page_visits,
+           updated_at FROM user_sessions WHERE updated_at > '<watermark>')
+           TO 'sessions.csv' CSV HEADER
+
+Usage:
+    python session_rollup.py sessions.csv [more exports...] [--state FILE] [--out DIR]
+    python session_rollup.py --summary 2025-08-01 2025-08-31
+"""
+
+import argparse
+import base64
+import csv
+import gzip
+import hashlib
+import json
+import math
+import re
+import sys
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_OUT_DIR = SCRIPT_DIR / 'session_rollup'
+STATE_NAME = 'session_rollup_state.json'
+STATE_VERSION = 1
+
+# A session is rolled up once it has had no update for this long;
+# the tracker writes every 10s while the app is open
+SETTLE_MINUTES = 30
+# Hourly buckets older than this are dropped from the state (daily ones are kept)
+HOURLY_RETENTION_DAYS = 14
+
+HLL_PRECISION = 11          # 2048 registers, ~2.3% standard error
+TDIGEST_COMPRESSION = 100
+
+# /game/6f1c...-... and /course/12 become /game/:id and /course/:id
+PATH_ID = re.compile(
+    r'/(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)(?=/|$)', re.IGNORECASE
+)
+DIGIT = re.compile(r'\d')
+
+
+# ============================================
+# Sketches
+# ============================================
+
+class HyperLogLog:
+    """Distinct counter in 2^p one-byte registers; merge is a per-register max"""
+
+    def __init__(self, p=HLL_PRECISION, registers=None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    @staticmethod
+    def hash(value):
+        return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def add(self, value):
+        self.add_hash(self.hash(value))
+
+    def add_hash(self, x):
+        """Add a value hashed with HyperLogLog.hash (lets callers hash once per row)"""
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog p={other.p} into p={self.p}")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Linear counting is more accurate for small cardinalities
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return round(estimate)
+
+    def to_state(self):
+        return f'{self.p}:' + base64.b64encode(zlib.compress(bytes(self.registers), 9)).decode('ascii')
+
+    @classmethod
+    def from_state(cls, state):
+        p, data = state.split(':', 1)
+        return cls(int(p), bytearray(zlib.decompress(base64.b64decode(data))))
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) for streaming quantiles. Values are buffered
+    and periodically merged into at most ~compression centroids; digests
+    merge by pooling their centroids and compressing again.
+    """
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.centroids = []     # [(mean, weight)] sorted by mean
+        self.buffer = []
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1.0):
+        self.buffer.append((value, weight))
+        self.total += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.buffer) >= self.compression * 5:
+            self._compress()
+
+    def merge(self, other):
+        other._compress()
+        self.buffer.extend(other.centroids)
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _q_limit(self, q):
+        """Largest quantile the current centroid may reach (k1 scale function)"""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compress(self):
+        if not self.buffer:
+            return
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        merged = []
+        so_far = 0.0
+        limit = self.total * self._q_limit(0.0)
+        mean, weight = points[0]
+        for value, w in points[1:]:
+            if so_far + weight + w <= limit:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                so_far += weight
+                limit = self.total * self._q_limit(so_far / self.total)
+                mean, weight = value, w
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def quantile(self, q):
+        self._compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        target = q * self.total
+        # Interpolate between centroid centres, using min/max at the tails
+        previous_mean, previous_position = self.min, 0.0
+        cumulative = 0.0
+        for mean, weight in self.centroids:
+            position = cumulative + weight / 2
+            if target < position:
+                span = position - previous_position
+                fraction = (target - previous_position) / span if span else 0
+                return previous_mean + (mean - previous_mean) * fraction
+            previous_mean, previous_position = mean, position
+            cumulative += weight
+        span = self.total - previous_position
+        fraction = (target - previous_position) / span if span else 1
+        return previous_mean + (self.max - previous_mean) * min(fraction, 1)
+
+    def to_state(self):
+        self._compress()
+        return {
+            'compression': self.compression,
+            'min': self.min if self.total else None,
+            'max': self.max if self.total else None,
+            'centroids': [[round(m, 3), w] for m, w in self.centroids],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        digest = cls(state['compression'])
+        digest.centroids = [(m, w) for m, w in state['centroids']]
+        digest.total = sum(w for _, w in digest.centroids)
+        if digest.total:
+            digest.min = state['min']
+            digest.max = state['max']
+        return digest
+
+
+# ============================================
+# Buckets
+# ============================================
+
+class Bucket:
+    """Everything kept for one hour or day"""
+
+    def __init__(self):
+        self.sessions = 0
+        self.users = HyperLogLog()
+        self.durations = TDigest()
+        self.pages = Counter()
+
+    def add(self, user_hash, duration, pages):
+        self.sessions += 1
+        if user_hash is not None:
+            self.users.add_hash(user_hash)
+        if duration is not None:
+            self.durations.add(duration)
+        counts = self.pages
+        for page, visits in pages.items():
+            counts[page] = counts.get(page, 0) + visits
+
+    def merge(self, other):
+        self.sessions += other.sessions
+        self.users.merge(other.users)
+        self.durations.merge(other.durations)
+        self.pages.update(other.pages)
+        return self
+
+    def summary(self):
+        percentiles = [self.durations.quantile(q) for q in (0.5, 0.9, 0.99)]
+        return {
+            'sessions': self.sessions,
+            'active_users': self.users.count(),
+            'duration_p50': round(percentiles[0]) if percentiles[0] is not None else None,
+            'duration_p90': round(percentiles[1]) if percentiles[1] is not None else None,
+            'duration_p99': round(percentiles[2]) if percentiles[2] is not None else None,
+            'page_visits': dict(self.pages.most_common()),
+        }
+
+    def to_state(self):
+        return {
+            'sessions': self.sessions,
+            'users': self.users.to_state(),
+            'durations': self.durations.to_state(),
+            'pages': dict(self.pages),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        bucket = cls()
+        bucket.sessions = state['sessions']
+        bucket.users = HyperLogLog.from_state(state['users'])
+        bucket.durations = TDigest.from_state(state['durations'])
+        bucket.pages = Counter(state['pages'])
+        return bucket
+
+
+def load_state(path):
+    if not path.exists():
+        return {'watermark': None, 'hourly': {}, 'daily': {}}
+    state = json.loads(path.read_text(encoding='utf-8'))
+    if state.get('version') != STATE_VERSION:
+        print(f"[ERROR] {path.name} has version {state.get('version')}, expected {STATE_VERSION}")
+        sys.exit(1)
+    return {
+        'watermark': state['watermark'],
+        'hourly': {k: Bucket.from_state(v) for k, v in state['hourly'].items()},
+        'daily': {k: Bucket.from_state(v) for k, v in state['daily'].items()},
+    }
+
+
+def save_state(path, state):
+    payload = {
+        'version': STATE_VERSION,
+        'watermark': state['watermark'],
+        'hourly': {k: b.to_state() for k, b in sorted(state['hourly'].items())},
+        'daily': {k: b.to_state() for k, b in sorted(state['daily'].items())},
+    }
+    path.write_text(json.dumps(payload, separators=(',', ':')), encoding='utf-8')
+
+
+# ============================================
+# Input
+# ============================================
+
+def open_export(path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def read_sessions(path):
+    """Yield session dicts from a CSV (with header) or NDJSON export"""
+    name = path.name[:-3] if path.suffix == '.gz' else path.name
+    with open_export(path) as f:
+        if name.endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def parse_time(value):
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace(' ', 'T', 1))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def normalise_pages(page_visits):
+    if isinstance(page_visits, str):
+        page_visits = json.loads(page_visits) if page_visits else {}
+    pages = {}
+    for page, visits in (page_visits or {}).items():
+        page = page.split('?')[0]
+        if DIGIT.search(page):
+            page = PATH_ID.sub('/:id', page)
+        page = page or '/'
+        pages[page] = pages.get(page, 0) + int(visits)
+    return pages
+
+
+def session_duration(row, entry, updated):
+    """Stored duration, else exit - entry, else time until the last update"""
+    if row.get('session_duration') not in (None, ''):
+        return int(row['session_duration'])
+    end = parse_time(row.get('exit_time')) or updated
+    if end is None:
+        return None
+    return max(int((end - entry).total_seconds()), 0)
+
+
+def rollup(paths, state, cutoff):
+    """
+    Fold settled sessions from the exports into the state.
+    Returns (changed bucket keys, counters).
+    """
+    watermark = parse_time(state['watermark'])
+    changed = {'hourly': set(), 'daily': set()}
+    counters = Counter()
+    seen = set()
+    newest = watermark
+    bucket_keys = {}
+
+    for path in paths:
+        for row in read_sessions(path):
+            counters['rows'] += 1
+            entry = parse_time(row.get('entry_time'))
+            updated = parse_time(row.get('updated_at')) or entry
+            if entry is None:
+                counters['invalid'] += 1
+                continue
+            if watermark and updated <= watermark:
+                counters['already_rolled_up'] += 1
+                continue
+            if updated > cutoff:
+                counters['still_active'] += 1
+                continue
+            # Overlapping exports may repeat a session
+            if row.get('id') in seen:
+                counters['duplicates'] += 1
+                continue
+            seen.add(row.get('id'))
+
+            user_id = row.get('user_id')
+            user_hash = HyperLogLog.hash(user_id) if user_id else None
+            duration = session_duration(row, entry, updated)
+            pages = normalise_pages(row.get('page_visits'))
+
+            hour_number = int(entry.timestamp()) // 3600
+            keys = bucket_keys.get(hour_number)
+            if keys is None:
+                hour_start = datetime.fromtimestamp(hour_number * 3600, timezone.utc)
+                keys = bucket_keys[hour_number] = (
+                    hour_start.strftime('%Y-%m-%dT%H:00:00Z'), hour_start.strftime('%Y-%m-%d')
+                )
+            hour, day = keys
+            for period, key in (('hourly', hour), ('daily', day)):
+                bucket = state[period].get(key)
+                if bucket is None:
+                    bucket = state[period][key] = Bucket()
+                bucket.add(user_hash, duration, pages)
+            changed['hourly'].add(hour)
+            changed['daily'].add(day)
+            counters['rolled_up'] += 1
+            if newest is None or updated > newest:
+                newest = updated
+
+    # Sessions deferred as still active are picked up by the next run
+    if newest is not None:
+        state['watermark'] = min(newest, cutoff).isoformat()
+    return changed, counters
+
+
+def prune_hourly(state, now):
+    horizon = (now - timedelta(days=HOURLY_RETENTION_DAYS)).strftime('%Y-%m-%dT%H:00:00Z')
+    for key in [k for k in state['hourly'] if k < horizon]:
+        del state['hourly'][key]
+
+
+# ============================================
+# Output
+# ============================================
+
+def sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def upsert_sql(table, key, bucket):
+    """Rows carry full bucket values, so re-applying an upsert is harmless"""
+    summary = bucket.summary()
+    state = bucket.to_state()
+    values = [
+        sql_literal(key),
+        str(summary['sessions']),
+        str(summary['active_users']),
+        sql_literal(summary['duration_p50']),
+        sql_literal(summary['duration_p90']),
+        sql_literal(summary['duration_p99']),
+        sql_literal(json.dumps(summary['page_visits'], separators=(',', ':'))) + '::jsonb',
+        sql_literal(state['users']),
+        sql_literal(json.dumps(state['durations'], separators=(',', ':'))) + '::jsonb',
+    ]
+    return (
+        f"INSERT INTO {table} (bucket_start, sessions, active_users, duration_p50, duration_p90, "
+        f"duration_p99, page_visits, users_sketch, duration_sketch) VALUES ({', '.join(values)})\n"
+        f"ON CONFLICT (bucket_start) DO UPDATE SET sessions = EXCLUDED.sessions, "
+        f"active_users = EXCLUDED.active_users, duration_p50 = EXCLUDED.duration_p50, "
+        f"duration_p90 = EXCLUDED.duration_p90, duration_p99 = EXCLUDED.duration_p99, "
+        f"page_visits = EXCLUDED.page_visits, users_sketch = EXCLUDED.users_sketch, "
+        f"duration_sketch = EXCLUDED.duration_sketch, updated_at = now();"
+    )
+
+
+def write_upserts(path, state, changed):
+    lines = ['-- Generated by session_rollup.py', 'BEGIN;']
+    for key in sorted(changed['hourly']):
+        if key in state['hourly']:
+            lines.append(upsert_sql('session_rollup_hourly', key, state['hourly'][key]))
+    for key in sorted(changed['daily']):
+        lines.append(upsert_sql('session_rollup_daily', key, state['daily'][key]))
+    lines += ['COMMIT;', '']
+    path.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def print_summary(state, first, last):
+    """Merge the daily buckets in [first, last] - distinct users are not summed"""
+    keys = [k for k in sorted(state['daily']) if first <= k <= last]
+    if not keys:
+        print(f"No daily buckets between {first} and {last}")
+        return
+    total = Bucket()
+    for key in keys:
+        total.merge(state['daily'][key])
+    summary = total.summary()
+    print(f"=== Sessions {keys[0]} .. {keys[-1]} ({len(keys)} days) ===")
+    print(f"Sessions:     {summary['sessions']:,}")
+    print(f"Active users: {summary['active_users']:,} (estimated)")
+    print(f"Duration:     p50 {summary['duration_p50']}s, p90 {summary['duration_p90']}s, "
+          f"p99 {summary['duration_p99']}s")
+    print("Top pages:")
+    for page, visits in list(summary['page_visits'].items())[:10]:
+        print(f"  {page:30} {visits:,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('exports', nargs='*', type=Path)
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument('--state', type=Path, help=f"Defaults to OUT/{STATE_NAME}")
+    parser.add_argument('--as-of', help="Export time (ISO 8601); defaults to now")
+    parser.add_argument('--settle-minutes', type=int, default=SETTLE_MINUTES)
+    parser.add_argument('--summary', nargs=2, metavar=('FIRST_DAY', 'LAST_DAY'))
+    args = parser.parse_args(argv)
+
+    state_path = args.state or args.out / STATE_NAME
+    state = load_state(state_path)
+
+    if args.summary:
+        print_summary(state, *args.summary)
+        return
+    if not args.exports:
+        parser.error("no export files given")
+
+    now = parse_time(args.as_of) if args.as_of else datetime.now(timezone.utc)
+    cutoff = now - timedelta(minutes=args.settle_minutes)
+
+    print("Rolling up user_sessions exports...")
+    print("-" * 50)
+    start = time.perf_counter()
+    changed, counters = rollup(args.exports, state, cutoff)
+    prune_hourly(state, now)
+    elapsed = time.perf_counter() - start
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    save_state(state_path, state)
+    upserts = args.out / 'session_rollup_upserts.sql'
+    write_upserts(upserts, state, changed)
+
+    print(f"Rows read:          {counters['rows']:,} ({counters['rows'] / max(elapsed, 1e-9):,.0f}/s)")
+    print(f"Rolled up:          {counters['rolled_up']:,}")
+    print(f"Already rolled up:  {counters['already_rolled_up']:,}")
+    print(f"Still active:       {counters['still_active']:,} (next run)")
+    if counters['duplicates'] or counters['invalid']:
+        print(f"[WARNING] {counters['duplicates']} duplicate and {counters['invalid']} invalid rows skipped")
+    print(f"Buckets updated:    {len(changed['hourly'])} hourly, {len(changed['daily'])} daily")
+    print(f"Upserts:            {upserts} ({upserts.stat().st_size:,} bytes)")
+    print(f"State:              {state_path} ({state_path.stat().st_size:,} bytes)")
+    print(f"\nNext export: WHERE updated_at > '{state['watermark']}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Synthetic load generator for the game tables
+Builds users, games, participants and hole scores on top of the real seed
+courses: pars and stroke indexes come from the seed files, course handicaps
+from the tee ratings, and each hole score is drawn from a distribution that
+depends on the strokes the player receives there. Output is deterministic
+for a given --seed (whatever the worker count) and is written as COPY text
+files plus a psql script that loads them in foreign-key order.
+
+Usage: python synthetic_load.py [--users N] [--games N] [--seed N] [--workers N] [--out DIR]
+"""
+
+import argparse
+import calendar
+import json
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect
+from multiprocessing import Pool
+from pathlib import Path
+
+from seed_sql import SEED_DIR, load_seed_tables
+
+DEFAULT_OUT_DIR = SEED_DIR / 'synthetic_load'
+# Glob for one table's shard files ({table}.00000.tsv, ...)
+SHARD_GLOB = '{}.[0-9][0-9][0-9][0-9][0-9].tsv'
+
+# Games per shard. Each shard has its own RNG stream and output files,
+# so results do not depend on how shards are spread over workers.
+SHARD_GAMES = 5000
+SHARD_USERS = 50000
+
+# Deterministic UUIDs: a per-table prefix plus the row number
+USER_ID = 'a0000000-0000-4000-8000-{:012x}'
+GAME_ID = 'b0000000-0000-4000-8000-{:012x}'
+
+MAX_COURSE_HANDICAP = 60
+
+# (players, weight): most rounds are fourballs or twosomes
+PLAYER_COUNTS = [(1, 5), (2, 30), (3, 20), (4, 45)]
+WEATHER = ['sunny', 'partly_cloudy', 'rainy', 'windy']
+# (scoring_format, handicap_type, scoring_method, weight)
+FORMATS = [
+    ('match_play', 'match_play', 'match_play', 55),
+    ('stroke_play', 'stroke_play', 'net_score', 35),
+    ('stroke_play', 'stroke_play', 'stableford', 10),
+]
+# Share of games still in progress / not started when the snapshot is taken
+ACTIVE_SHARE = 0.03
+SETUP_SHARE = 0.01
+
+FIRST_NAMES = ['Alejandro', 'Carmen', 'Javier', 'Lucia', 'Pablo', 'Marta', 'Diego', 'Elena',
+               'Sergio', 'Laura', 'Miguel', 'Sofia', 'Carlos', 'Isabel', 'Jorge', 'Ana']
+LAST_NAMES = ['Garcia', 'Fernandez', 'Lopez', 'Martinez', 'Sanchez', 'Perez', 'Gomez',
+              'Martin', 'Jimenez', 'Ruiz', 'Hernandez', 'Diaz', 'Moreno', 'Alvarez']
+
+TABLES = {
+    'profiles': ['id', 'full_name', 'email', 'handicap', 'home_course', 'created_at', 'updated_at'],
+    'games': ['id', 'course_id', 'creator_user_id', 'scoring_format', 'handicap_type',
+              'scoring_method', 'weather_condition', 'status', 'num_holes', 'created_at',
+              'started_at', 'completed_at'],
+    'game_participants': ['game_id', 'user_id', 'tee_box_id', 'handicap_index',
+                          'course_handicap', 'playing_handicap', 'match_handicap',
+                          'total_strokes', 'total_putts', 'net_score',
+                          'front_nine_strokes', 'back_nine_strokes'],
+    # net_score and score_vs_par are generated columns; player_match_par is
+    # filled by the calculate_player_match_par trigger
+    'game_hole_scores': ['game_id', 'user_id', 'hole_number', 'strokes', 'putts', 'hole_par',
+                         'hole_handicap_strokes', 'updated_at'],
+}
+NULL = '\\N'
+
+
+# ============================================
+# Score model
+# ============================================
+
+def handicap_strokes(course_handicap, ranks):
+    """
+    Strokes over par a player of this course handicap is expected to need per
+    hole: CH spread over the course's holes by stroke index rank. Only drives
+    the score model; the strokes stored per hole come from hole_strokes().
+    """
+    n = len(ranks)
+    if course_handicap <= 0:
+        return [0] * n
+    base, extra = divmod(course_handicap, n)
+    return [base + (rank < extra) for rank in ranks]
+
+
+def hole_strokes(handicap, stroke_indexes):
+    """
+    Strokes received per hole as calculateHoleStrokes() allocates them: one
+    per full 18 of handicap, plus one where the raw stroke index is within
+    the remainder
+    """
+    if handicap <= 0:
+        return [0] * len(stroke_indexes)
+    base, extra = divmod(handicap, 18)
+    return [base + (extra > 0 and si <= extra) for si in stroke_indexes]
+
+
+def poisson_pmf(lam, limit):
+    pmf = [math.exp(-lam)]
+    for k in range(1, limit):
+        pmf.append(pmf[-1] * lam / k)
+    return pmf
+
+
+def stroke_cdf(par, received, mean_over, birdie):
+    """
+    Distribution of strokes on one hole. Strokes over par follow
+    Poisson(mean_over + birdie) minus a Bernoulli(birdie) birdie chance,
+    capped at net double bogey (par + 2 + received) as WHS does.
+    Returns (values, cumulative probabilities) for bisect sampling.
+    """
+    cap = par + 2 + received
+    lam = max(mean_over + birdie, 0.01)
+    pmf = poisson_pmf(lam, 12)
+    probs = {}
+    for over, p in enumerate(pmf):
+        for shift, q in ((0, 1 - birdie), (-1, birdie)):
+            strokes = min(max(par + over + shift, 1), cap)
+            probs[strokes] = probs.get(strokes, 0) + p * q
+    values = sorted(probs)
+    total = sum(probs.values())
+    cdf, running = [], 0.0
+    for v in values:
+        running += probs[v] / total
+        cdf.append(running)
+    cdf[-1] = 1.0
+    return values, cdf
+
+
+def build_course_model(course, holes, tees):
+    """
+    Precompute per-hole score CDFs for every effective course handicap,
+    so the hot loop is a random() and a bisect per hole.
+    """
+    holes = sorted(holes, key=lambda h: h['hole_number'])
+    # Course 5 has more holes in the seed than the course declares
+    holes = holes[:course.get('holes') or len(holes)]
+    by_index = sorted(range(len(holes)), key=lambda i: (holes[i]['handicap_index'] or 99, i))
+    ranks = [0] * len(holes)
+    for rank, i in enumerate(by_index):
+        ranks[i] = rank
+
+    n = len(holes)
+    pars = [h['par'] for h in holes]
+    # Harder holes (low stroke index) play slightly over their allowance for everyone
+    difficulty = [0.15 * ((n - 1) / 2 - rank) / max((n - 1) / 2, 1) for rank in ranks]
+
+    tables = []
+    for ch in range(MAX_COURSE_HANDICAP + 1):
+        received = handicap_strokes(ch, ranks)
+        # Average player finishes ~2 strokes above their course handicap
+        birdie = min(max(0.22 - 0.008 * ch, 0.02), 0.22)
+        tables.append([
+            stroke_cdf(pars[i], received[i], received[i] + 2 / n + difficulty[i], birdie)
+            for i in range(n)
+        ])
+
+    par_total = sum(pars)
+    tee_rows = [{
+        'id': t['id'],
+        'slope': t.get('slope_rating') or 113,
+        'rating': float(t.get('course_rating') or par_total),
+    } for t in sorted(tees, key=lambda t: (t.get('display_order') or 0, t['id']))]
+
+    return {
+        'id': course['id'],
+        'holes': [h['hole_number'] for h in holes],
+        'pars': pars,
+        'stroke_indexes': [h['handicap_index'] for h in holes],
+        'par_total': par_total,
+        'tees': tee_rows,
+        'tables': tables,
+    }
+
+
+def build_model(tables):
+    holes_by_course = {}
+    for hole in tables.get('holes', {}).values():
+        holes_by_course.setdefault(hole['course_id'], []).append(hole)
+    tees_by_course = {}
+    for tee in tables.get('tee_boxes', {}).values():
+        tees_by_course.setdefault(tee['course_id'], []).append(tee)
+
+    courses = []
+    for course in sorted(tables.get('golf_courses', {}).values(), key=lambda c: c['id']):
+        holes = holes_by_course.get(course['id'])
+        tees = tees_by_course.get(course['id'])
+        if not holes or not tees:
+            print(f"[WARNING] Course {course['id']} has no holes or tees - skipped")
+            continue
+        courses.append(build_course_model(course, holes, tees))
+    return courses
+
+
+def putt_cdf(ch):
+    """One/two/three putt probabilities drift upwards with handicap"""
+    three = min(0.03 + 0.004 * ch, 0.25)
+    one = max(0.30 - 0.005 * ch, 0.08)
+    return [one, 1 - three]
+
+
+PUTT_CDFS = [putt_cdf(ch) for ch in range(MAX_COURSE_HANDICAP + 1)]
+
+
+def user_handicaps(users, seed):
+    """Handicap index in tenths for every user, skewed towards mid handicaps"""
+    rng = random.Random(f'{seed}:handicaps')
+    return [min(max(round(rng.gammavariate(4.0, 4.5) * 10 - 20), -40), 540) for _ in range(users)]
+
+
+# ============================================
+# Workers
+# ============================================
+
+_model = None
+_handicaps = None
+
+
+def init_worker(model, handicaps):
+    global _model, _handicaps
+    _model = model
+    _handicaps = handicaps
+
+
+def timestamp(epoch):
+    return time.strftime('%Y-%m-%d %H:%M:%S+00', time.gmtime(epoch))
+
+
+def write_profiles(job):
+    shard, first, last, seed, out_dir, start_epoch = job
+    rng = random.Random(f'{seed}:profiles:{shard}')
+    lines = []
+    for n in range(first, last):
+        created = timestamp(start_epoch - rng.randrange(0, 730 * 86400))
+        lines.append('\t'.join((
+            USER_ID.format(n),
+            f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            f'player{n}@example.test',
+            f'{_handicaps[n] / 10:.1f}',
+            'La Moraleja',
+            created,
+            created,
+        )))
+    path = out_dir / f'profiles.{shard:05d}.tsv'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return {'profiles': len(lines)}
+
+
+def write_games(job):
+    shard, first, last, seed, out_dir, start_epoch, days = job
+    rng = random.Random(f'{seed}:games:{shard}')
+    random_ = rng.random
+    courses = _model
+    handicaps = _handicaps
+    users = len(handicaps)
+    counts, count_weights = zip(*PLAYER_COUNTS)
+    formats = [f[:3] for f in FORMATS]
+    format_weights = [f[3] for f in FORMATS]
+
+    files = {table: open(out_dir / f'{table}.{shard:05d}.tsv', 'w', encoding='utf-8')
+             for table in ('games', 'game_participants', 'game_hole_scores')}
+    written = dict.fromkeys(files, 0)
+    try:
+        game_lines, player_lines, score_lines = [], [], []
+        for n in range(first, last):
+            game_id = GAME_ID.format(n)
+            course = courses[rng.randrange(len(courses))]
+            players = rng.sample(range(users), rng.choices(counts, count_weights)[0])
+            scoring_format, handicap_type, scoring_method = rng.choices(formats, format_weights)[0]
+
+            # Tee times every 10 minutes between 07:00 and 18:00
+            started = start_epoch + rng.randrange(days) * 86400 + rng.randrange(420, 1080, 10) * 60
+            roll = random_()
+            if roll < SETUP_SHARE:
+                status, holes_played = 'setup', 0
+            elif roll < SETUP_SHARE + ACTIVE_SHARE:
+                status, holes_played = 'active', rng.randrange(1, len(course['holes']))
+            else:
+                status, holes_played = 'completed', len(course['holes'])
+            minutes_per_hole = 11 + len(players) * 2
+            hole_times = [timestamp(started + (i + 1) * minutes_per_hole * 60)
+                          for i in range(holes_played)]
+
+            game_lines.append('\t'.join((
+                game_id, str(course['id']), USER_ID.format(players[0]),
+                scoring_format, handicap_type, scoring_method, rng.choice(WEATHER), status,
+                str(len(course['holes'])),
+                timestamp(started - 600),
+                timestamp(started) if holes_played else NULL,
+                hole_times[-1] if status == 'completed' else NULL,
+            )))
+
+            # Course and playing handicaps as calculateCourseHandicap() computes them
+            entries = []
+            for user in players:
+                tee = course['tees'][0 if random_() < 0.6 else rng.randrange(len(course['tees']))]
+                index = handicaps[user] / 10
+                ch = round(index * tee['slope'] / 113 + tee['rating'] - course['par_total'])
+                entries.append((user, tee, index, ch))
+            lowest = min(ch for *_, ch in entries)
+
+            pars = course['pars']
+            stroke_indexes = course['stroke_indexes']
+            hole_numbers = course['holes']
+            for user, tee, index, ch in entries:
+                user_id = USER_ID.format(user)
+                match = ch - lowest if scoring_format == 'match_play' else ch
+                # Hole strokes follow the match handicap, as getStrokesOnHole() does
+                match_received = hole_strokes(match, stroke_indexes)
+                # Day-to-day form: play this round off a shifted handicap
+                form = min(max(ch + round(rng.gauss(0, 2.5)), 0), MAX_COURSE_HANDICAP)
+                cdfs = course['tables'][form]
+                putts_cdf = PUTT_CDFS[form]
+
+                total = putts_total = front = back = 0
+                for i in range(holes_played):
+                    values, cdf = cdfs[i]
+                    strokes = values[bisect(cdf, random_())]
+                    putts = 1 + bisect(putts_cdf, random_())
+                    putts = min(putts, strokes - 1)
+                    total += strokes
+                    putts_total += putts
+                    if hole_numbers[i] <= 9:
+                        front += strokes
+                    else:
+                        back += strokes
+                    score_lines.append(
+                        f'{game_id}\t{user_id}\t{hole_numbers[i]}\t{strokes}\t{putts}\t'
+                        f'{pars[i]}\t{match_received[i]}\t{hole_times[i]}'
+                    )
+
+                if holes_played:
+                    totals = (str(total), str(putts_total),
+                              str(total - sum(match_received[:holes_played])), str(front), str(back))
+                else:
+                    totals = (NULL,) * 5
+                player_lines.append('\t'.join((
+                    game_id, user_id, str(tee['id']), f'{index:.1f}',
+                    str(ch), str(ch), str(match), *totals,
+                )))
+
+            if len(score_lines) >= 50000:
+                flush(files, written, game_lines, player_lines, score_lines)
+        flush(files, written, game_lines, player_lines, score_lines)
+    finally:
+        for f in files.values():
+            f.close()
+    return written
+
+
+def flush(files, written, game_lines, player_lines, score_lines):
+    for table, lines in (('games', game_lines), ('game_participants', player_lines),
+                         ('game_hole_scores', score_lines)):
+        if lines:
+            files[table].write('\n'.join(lines) + '\n')
+            written[table] += len(lines)
+            lines.clear()
+
+
+# ============================================
+# Driver
+# ============================================
+
+def shards(total, size):
+    return [(i, start, min(start + size, total)) for i, start in enumerate(range(0, total, size))]
+
+
+def write_load_script(out_dir, files_by_table):
+    """psql script that loads the files in foreign-key order"""
+    lines = [
+        '-- Generated by synthetic_load.py',
+        '-- Run from this directory: psql "$DATABASE_URL" -f load.sql',
+        '\\set ON_ERROR_STOP on',
+        'BEGIN;',
+    ]
+    for table, columns in TABLES.items():
+        for name in files_by_table.get(table, []):
+            lines.append(f"\\copy {table} ({', '.join(columns)}) FROM '{name}'")
+    lines += ['COMMIT;', 'ANALYZE profiles, games, game_participants, game_hole_scores;', '']
+    (out_dir / 'load.sql').write_text('\n'.join(lines), encoding='utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--games', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--days', type=int, default=365, help="Spread games over this many days")
+    parser.add_argument('--start-date', default='2025-01-01')
+    parser.add_argument('--out', type=Path, default=DEFAULT_OUT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.users < 4:
+        print("[ERROR] Need at least 4 users to fill a fourball")
+        sys.exit(1)
+
+    model = build_model(load_seed_tables())
+    if not model:
+        print("[ERROR] No playable courses in seed data")
+        sys.exit(1)
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    # Only this tool's shard files; --out may be shared with other output
+    for table in TABLES:
+        for stale in args.out.glob(SHARD_GLOB.format(table)):
+            stale.unlink()
+
+    start_epoch = calendar.timegm(time.strptime(args.start_date, '%Y-%m-%d'))
+    handicaps = user_handicaps(args.users, args.seed)
+
+    print(f"Generating {args.users:,} users and {args.games:,} games "
+          f"on {len(model)} courses with {args.workers} workers (seed {args.seed})...")
+    start = time.perf_counter()
+    totals = dict.fromkeys(TABLES, 0)
+    profile_jobs = [(shard, first, last, args.seed, args.out, start_epoch)
+                    for shard, first, last in shards(args.users, SHARD_USERS)]
+    game_jobs = [(shard, first, last, args.seed, args.out, start_epoch, args.days)
+                 for shard, first, last in shards(args.games, SHARD_GAMES)]
+
+    with Pool(args.workers, initializer=init_worker, initargs=(model, handicaps)) as pool:
+        results = pool.imap_unordered(write_profiles, profile_jobs)
+        results = [*results, *pool.imap_unordered(write_games, game_jobs)]
+    for counts in results:
+        for table, count in counts.items():
+            totals[table] += count
+
+    elapsed = time.perf_counter() - start
+    files_by_table = {table: sorted(p.name for p in args.out.glob(SHARD_GLOB.format(table)))
+                      for table in TABLES}
+    write_load_script(args.out, files_by_table)
+
+    total_rows = sum(totals.values())
+    manifest = {
+        'seed': args.seed,
+        'users': args.users,
+        'games': args.games,
+        'start_date': args.start_date,
+        'days': args.days,
+        'rows': totals,
+    }
+    (args.out / 'manifest.json').write_text(json.dumps(manifest, indent=2) + '\n', encoding='utf-8')
+
+    for table, count in totals.items():
+        print(f"  {table}: {count:,} rows in {len(files_by_table[table])} files")
+    print(f"[OK] {total_rows:,} rows in {elapsed:.1f}s "
+          f"({total_rows / elapsed * 60 / 1e6:.1f}M rows/min)")
+    print(f"Output: {args.out} (load with: psql -f load.sql)")
+
+
+if __name__ == "__main__":
+    main()
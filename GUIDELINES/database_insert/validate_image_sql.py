@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Offline validator for the large image SQL artifacts
+Streams 09_course_images.sql / insert-images.sql / 10_course*_image.sql with
+bounded memory, decodes every '\\x...'::bytea and decode(..., 'hex'|'base64')
+literal in chunks, and checks the JPEG/PNG signature, end marker, declared
+file_size and whether the bytes match a source file in GUIDELINES/images.
+
+Usage: python validate_image_sql.py [FILE ...] [--chunk-size BYTES]
+"""
+
+import argparse
+import base64
+import binascii
+import hashlib
+import re
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+IMAGES_DIR = SCRIPT_DIR.parent / 'images'
+
+DEFAULT_FILES = ['09_course_images.sql', 'insert-images.sql']
+DEFAULT_GLOB = '10_course*_image.sql'
+
+CHUNK_SIZE = 64 * 1024
+# Literals longer than this are streamed through the decoders instead of kept
+MAX_INLINE_LITERAL = 512
+
+JPEG_START = b'\xff\xd8\xff'
+JPEG_END = b'\xff\xd9'
+PNG_START = b'\x89PNG\r\n\x1a\n'
+PNG_END = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+
+WHITESPACE = re.compile(r'\s+')
+
+
+class DigestSink:
+    """Keeps only what the checks need: length, sha256, first and last bytes"""
+
+    def __init__(self):
+        self.length = 0
+        self.sha256 = hashlib.sha256()
+        self.head = b''
+        self.tail = b''
+
+    def write(self, data):
+        if not data:
+            return
+        self.length += len(data)
+        self.sha256.update(data)
+        if len(self.head) < 16:
+            self.head += data[:16 - len(self.head)]
+        self.tail = (self.tail + data)[-16:]
+
+
+class HexDecoder:
+    """Incremental hex decoder; carries an odd trailing digit between chunks"""
+
+    def __init__(self):
+        self.sink = DigestSink()
+        self.carry = ''
+        self.error = None
+
+    def feed(self, text):
+        if self.error:
+            return
+        text = self.carry + WHITESPACE.sub('', text)
+        cut = len(text) - len(text) % 2
+        self.carry = text[cut:]
+        try:
+            self.sink.write(bytes.fromhex(text[:cut]))
+        except ValueError as e:
+            self.error = f"invalid hex: {e}"
+
+    def finish(self):
+        if self.carry and not self.error:
+            self.error = "odd number of hex digits"
+        return self
+
+
+class Base64Decoder:
+    """Incremental base64 decoder; carries up to 3 chars between chunks"""
+
+    def __init__(self):
+        self.sink = DigestSink()
+        self.carry = ''
+        self.error = None
+
+    def feed(self, text):
+        if self.error:
+            return
+        text = self.carry + WHITESPACE.sub('', text)
+        cut = len(text) - len(text) % 4
+        self.carry = text[cut:]
+        try:
+            self.sink.write(base64.b64decode(text[:cut], validate=True))
+        except (binascii.Error, ValueError) as e:
+            self.error = f"invalid base64: {e}"
+
+    def finish(self):
+        if self.carry and not self.error:
+            self.error = "truncated base64 (length not a multiple of 4)"
+        return self
+
+
+class Blob:
+    """
+    A long string literal streamed through every decoder it could be.
+    The encoding is only known after the literal (decode(..., 'base64')),
+    so hex and base64 run side by side and the statement picks one.
+    """
+
+    def __init__(self, prefix):
+        if prefix.startswith('\\x'):
+            self.decoders = {'bytea': HexDecoder()}
+            prefix = prefix[2:]
+        else:
+            self.decoders = {'hex': HexDecoder(), 'base64': Base64Decoder()}
+        self.chars = 0
+        self.feed(prefix)
+
+    def feed(self, text):
+        self.chars += len(text)
+        for decoder in self.decoders.values():
+            decoder.feed(text)
+
+    def finish(self):
+        for decoder in self.decoders.values():
+            decoder.finish()
+        return self
+
+
+class SqlStreamScanner:
+    """
+    Character-level SQL scanner that never holds a large literal in memory.
+    Statement text is kept with literals replaced by placeholders (\\0N\\0);
+    completed statements are passed to on_statement(text, literals).
+    """
+
+    def __init__(self, on_statement):
+        self.on_statement = on_statement
+        self.state = 'normal'
+        self.pending = ''      # one char held back across chunk boundaries
+        self.statement = []
+        self.literals = []
+        self.literal = []
+        self.literal_len = 0
+        self.blob = None
+
+    def feed(self, chunk):
+        text = self.pending + chunk
+        self.pending = ''
+        i = 0
+        n = len(text)
+        while i < n:
+            if self.state == 'string':
+                quote = text.find("'", i)
+                if quote == -1:
+                    self._literal_text(text[i:])
+                    return
+                self._literal_text(text[i:quote])
+                if quote + 1 >= n:
+                    # Cannot tell '' from the closing quote yet
+                    self.pending = "'"
+                    return
+                if text[quote + 1] == "'":
+                    self._literal_text("'")
+                    i = quote + 2
+                else:
+                    self._close_literal()
+                    i = quote + 1
+                continue
+
+            if self.state == 'comment':
+                newline = text.find('\n', i)
+                if newline == -1:
+                    return
+                self.state = 'normal'
+                i = newline + 1
+                continue
+
+            ch = text[i]
+            if ch == '-':
+                if i + 1 >= n:
+                    self.pending = '-'
+                    return
+                if text[i + 1] == '-':
+                    self.state = 'comment'
+                    i += 2
+                    continue
+            if ch == "'":
+                self.state = 'string'
+                self.literal = []
+                self.literal_len = 0
+                self.blob = None
+            elif ch == ';':
+                self._emit()
+            else:
+                self.statement.append(ch)
+            i += 1
+
+    def _literal_text(self, text):
+        if not text:
+            return
+        if self.blob is not None:
+            self.blob.feed(text)
+            return
+        self.literal.append(text)
+        self.literal_len += len(text)
+        if self.literal_len > MAX_INLINE_LITERAL:
+            self.blob = Blob(''.join(self.literal))
+            self.literal = []
+
+    def _close_literal(self):
+        value = self.blob.finish() if self.blob is not None else ''.join(self.literal)
+        self.statement.append(f'\0{len(self.literals)}\0')
+        self.literals.append(value)
+        self.state = 'normal'
+        self.blob = None
+        self.literal = []
+
+    def _emit(self):
+        text = ''.join(self.statement).strip()
+        if text:
+            self.on_statement(text, self.literals)
+        self.statement = []
+        self.literals = []
+
+    def close(self):
+        if self.pending == '-':
+            self.statement.append('-')
+        self._emit()
+
+
+# ============================================
+# Row checks
+# ============================================
+
+INSERT_PATTERN = re.compile(
+    r'INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES\s*\((.*)\)', re.IGNORECASE | re.DOTALL
+)
+PLACEHOLDER = re.compile(r'\0(\d+)\0')
+
+
+def split_values(values):
+    parts, depth, token = [], 0, []
+    for ch in values:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(''.join(token).strip())
+            token = []
+            continue
+        token.append(ch)
+    parts.append(''.join(token).strip())
+    return parts
+
+
+def resolve_value(expr, literals):
+    """Return (python_value, encoding) for a VALUES expression"""
+    decode = re.fullmatch(r'decode\(\s*\0(\d+)\0\s*,\s*\0(\d+)\0\s*\)', expr, re.IGNORECASE)
+    if decode:
+        return literals[int(decode.group(1))], literals[int(decode.group(2))].lower()
+    bytea = re.fullmatch(r'E?\0(\d+)\0\s*::\s*bytea', expr, re.IGNORECASE)
+    if bytea:
+        return literals[int(bytea.group(1))], 'bytea'
+    literal = PLACEHOLDER.fullmatch(expr)
+    if literal:
+        return literals[int(literal.group(1))], None
+    if re.fullmatch(r'-?\d+', expr):
+        return int(expr), None
+    return expr, None
+
+
+def detect_format(sink):
+    if sink.head.startswith(JPEG_START):
+        return 'image/jpeg', sink.tail.endswith(JPEG_END)
+    if sink.head.startswith(PNG_START):
+        return 'image/png', sink.tail.endswith(PNG_END)
+    return None, False
+
+
+def check_row(row, source_hashes):
+    """Return (summary, problems) for one course_images row"""
+    problems = []
+    image, encoding = row.get('image_data', (None, None))
+    label = f"course {row.get('course_id', ('?',))[0]} {row.get('image_type', ('?',))[0]}"
+
+    if not isinstance(image, Blob):
+        return label, ["image_data is not a streamed bytea literal"]
+    decoder = image.decoders.get(encoding)
+    if decoder is None:
+        return label, [f"unsupported encoding {encoding!r}"]
+    if decoder.error:
+        return label, [decoder.error]
+
+    sink = decoder.sink
+    fmt, end_ok = detect_format(sink)
+    mime = row.get('mime_type', (None,))[0]
+    declared = row.get('file_size', (None,))[0]
+    digest = sink.sha256.hexdigest()
+
+    if fmt is None:
+        problems.append(f"unknown signature {sink.head[:8].hex()}")
+    elif not end_ok:
+        problems.append(f"missing {fmt.split('/')[1].upper()} end marker (truncated?)")
+    if fmt and mime and fmt != mime:
+        problems.append(f"mime_type {mime} but data is {fmt}")
+    if isinstance(declared, int) and declared != sink.length:
+        problems.append(f"file_size {declared} but decoded {sink.length} bytes")
+
+    source = source_hashes.get(digest)
+    summary = (f"{label}: {sink.length:,} bytes {fmt or '?'} via {encoding}, "
+               f"sha256 {digest[:12]}, source {source or 'no match'}")
+    return summary, problems
+
+
+def hash_sources(images_dir=IMAGES_DIR):
+    hashes = {}
+    for path in sorted(images_dir.rglob('*')):
+        if path.suffix.lower() in ('.jpg', '.jpeg', '.png') and path.is_file():
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(block)
+            hashes[digest.hexdigest()] = path.name
+    return hashes
+
+
+def validate_file(path, source_hashes, chunk_size=CHUNK_SIZE):
+    """Stream one SQL file; return (rows_checked, failures)"""
+    rows = []
+
+    def on_statement(text, literals):
+        match = INSERT_PATTERN.search(text)
+        if not match or match.group(1).lower() != 'course_images':
+            return
+        columns = [c.strip().lower() for c in match.group(2).split(',')]
+        values = split_values(match.group(3))
+        if len(values) != len(columns):
+            rows.append(('?', [f"{len(columns)} columns but {len(values)} values"]))
+            return
+        row = {c: resolve_value(v, literals) for c, v in zip(columns, values)}
+        rows.append(check_row(row, source_hashes))
+
+    scanner = SqlStreamScanner(on_statement)
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            scanner.feed(chunk)
+    scanner.close()
+
+    failures = 0
+    for summary, problems in rows:
+        print(f"  [{'ERROR' if problems else 'OK'}] {summary}")
+        for problem in problems:
+            print(f"      - {problem}")
+        failures += bool(problems)
+    if not rows:
+        print("  [!] No course_images inserts found")
+        failures += 1
+    return len(rows), failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', type=Path)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    files = args.files or ([SCRIPT_DIR / name for name in DEFAULT_FILES] +
+                           sorted(SCRIPT_DIR.glob(DEFAULT_GLOB)))
+
+    print("=== Validating image SQL artifacts ===")
+    start = time.perf_counter()
+    source_hashes = hash_sources()
+    print(f"Hashed {len(source_hashes)} source images in {IMAGES_DIR.name}/\n")
+
+    total_rows = total_failures = 0
+    for path in files:
+        if not path.exists():
+            print(f"[ERROR] {path} not found")
+            total_failures += 1
+            continue
+        print(f"{path.name} ({path.stat().st_size:,} bytes)")
+        rows, failures = validate_file(path, source_hashes, args.chunk_size)
+        total_rows += rows
+        total_failures += failures
+
+    elapsed = time.perf_counter() - start
+    print(f"\nRESULTS: {total_rows} images checked, {total_failures} failed ({elapsed:.2f}s)")
+    sys.exit(1 if total_failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+-- Pre-aggregated session analytics for Golf X dashboards
+-- Migration: 20261019_session_rollups.sql
+-- Filled by GUIDELINES/database_insert/session_rollup.py from user_sessions exports
+
+-- One row per hour / per day (UTC). The sketch columns let a dashboard merge
+-- any range of buckets (e.g. weekly active users) without touching user_sessions.
+CREATE TABLE IF NOT EXISTS session_rollup_hourly (
+  bucket_start timestamptz PRIMARY KEY,
+  sessions integer NOT NULL DEFAULT 0,
+  active_users integer NOT NULL DEFAULT 0,       -- HyperLogLog estimate
+  duration_p50 integer,                          -- seconds
+  duration_p90 integer,
+  duration_p99 integer,
+  page_visits jsonb NOT NULL DEFAULT '{}',       -- {"/home": 120, "/game/:id": 40}
+  users_sketch text,                             -- HyperLogLog registers (zlib + base64)
+  duration_sketch jsonb,                         -- t-digest centroids
+  updated_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS session_rollup_daily (
+  bucket_start date PRIMARY KEY,
+  sessions integer NOT NULL DEFAULT 0,
+  active_users integer NOT NULL DEFAULT 0,
+  duration_p50 integer,
+  duration_p90 integer,
+  duration_p99 integer,
+  page_visits jsonb NOT NULL DEFAULT '{}',
+  users_sketch text,
+  duration_sketch jsonb,
+  updated_at timestamptz DEFAULT now()
+);
+
+-- Rollup runs only pick up sessions updated since the previous run
+CREATE INDEX IF NOT EXISTS idx_user_sessions_updated_at ON user_sessions(updated_at);